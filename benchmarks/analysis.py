@@ -0,0 +1,72 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   python3 benchmarks/analysis.py [--templates PACK] [MILLIONS ...]
+#
+# Analyses random corpora of the given number of words (default: 1 2 4
+# million, of 3 to 12 characters, only half of them drawn from a vocabulary,
+# so most of them are distinct) through the command line interface, and
+# prints the elapsed time and the throughput of the analysis, including the
+# startup of the process. The template pack has to be extracted first
+# (blender -b ABC.blend --python transition/__main__.py -- --pack).
+
+# Import Python modules
+from sys import executable
+from shutil import rmtree
+from tempfile import mkdtemp
+from random import Random
+from subprocess import call, DEVNULL
+from time import perf_counter
+from argparse import ArgumentParser
+from string import ascii_lowercase
+from os.path import join, dirname, abspath
+
+# Paths of the add-on in the parent folder
+ROOT = dirname(dirname(abspath(__file__)))
+SCRIPT = join(ROOT, 'transition', '__main__.py')
+
+
+#------------------------------------------------------------------------------#
+def corpus(filepath, count, seed=0):
+    """
+    Writes count random words into the file, one word per line.
+    """
+    random = Random(seed)
+    word   = lambda: ''.join(random.choice(ascii_lowercase)
+                             for i in range(random.randint(3, 12)))
+    vocabulary = [word() for i in range(count//5)]
+    with open(filepath, 'w') as file:
+        for i in range(count):
+            file.write(random.choice(vocabulary) if i%2 else word())
+            file.write('\n')
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    parser = ArgumentParser(prog='analysis.py')
+    parser.add_argument('--templates')
+    parser.add_argument('millions', type=float, nargs='*', default=(1, 2, 4))
+    args = parser.parse_args()
+    command = [executable, SCRIPT, '--analyse']
+    if args.templates:
+        command.extend(('--templates', abspath(args.templates)))
+    folder = mkdtemp()
+    print('{:>9} {:>10} {:>12}'.format('millions', 'time', 'words/s'))
+    for millions in args.millions:
+        filepath = join(folder, 'words.txt')
+        corpus(filepath, int(millions*1000000))
+        start = perf_counter()
+        call(command + ['--words', filepath], stdout=DEVNULL)
+        elapsed = perf_counter() - start
+        print('{:>9} {:>9.3f}s {:>12.0f}'.format(millions, elapsed,
+                                                millions*1000000/elapsed))
+    rmtree(folder)
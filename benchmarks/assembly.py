@@ -0,0 +1,94 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   blender ABC.blend --python benchmarks/assembly.py -- [LENGTH ...]
+#   blender -b ABC.blend --python benchmarks/assembly.py -- [LENGTH ...]
+#
+# Compares the OPERATOR and the DIRECT mesh assembly on random texts of the
+# given lengths (default: 10 100 1000) and prints the results to stdout: the
+# elapsed times, the number of meshes left without users, and the vertex and
+# face counts of the results. DIRECT is measured without (cold) and with
+# (warm) the cached spans of the character pairs. The OPERATOR assembly can
+# only be measured when blender has a user interface (in the background the
+# new scene is not the current one, which the operators work on), otherwise
+# its columns are left empty.
+
+# Import Python modules
+from sys import argv, path
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from os.path import dirname, abspath
+
+# Import Blender modules
+import bpy
+
+# Import add-on from the parent folder and the helpers of the benchmarks
+path.insert(0, dirname(dirname(abspath(__file__))))
+path.insert(0, dirname(abspath(__file__)))
+import transition
+from transition import caches, chains
+from words import randtext
+
+
+#------------------------------------------------------------------------------#
+def measure(text, assembly, cold=False):
+    """
+    Builds a linear transition of text and returns the elapsed time, the
+    number of new orphan meshes and the number of vertices and faces in the
+    result. If cold, the spans cached in memory and on disk are dropped.
+    """
+    if cold:
+        chains._words['stamp'] = None
+        rmtree(caches.CACHE_PATH, ignore_errors=True)
+    orphans = sum(not mesh.users for mesh in bpy.data.meshes)
+    scenes  = set(bpy.data.scenes.keys())
+    start = perf_counter()
+    bpy.ops.mesh.transition_char_to_char(basetext=text,
+                                         circular=False,
+                                         assembly=assembly)
+    elapsed = perf_counter() - start
+    # Rename result scene, so the next run will create a new one (blender
+    # cuts the names to 63 characters, so it is found as the new scene)
+    scene = bpy.data.scenes[(set(bpy.data.scenes.keys()) - scenes).pop()]
+    scene.name = '{}_{}_{}'.format(assembly, cold, len(text))
+    mesh = scene.objects.active.data
+    orphans = sum(not mesh.users for mesh in bpy.data.meshes) - orphans
+    return elapsed, orphans, len(mesh.vertices), len(mesh.polygons)
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    transition.register()
+    # Do not touch the cache of the user
+    caches.CACHE_PATH = mkdtemp()
+    lengths = [int(a) for a in argv[argv.index('--') + 1:]] if '--' in argv else []
+    print('{:>6} {:>10} {:>10} {:>10} {:>16} {:>16} {:>16}'.format('chars',
+                                                                  'OPERATOR',
+                                                                  'cold',
+                                                                  'warm',
+                                                                  'orphans',
+                                                                  'verts',
+                                                                  'faces'))
+    for length in lengths or (10, 100, 1000):
+        text = randtext(length)
+        if bpy.context.screen is None:
+            time1, counts1 = '-', ('-',)*3
+        else:
+            time1, *counts1 = measure(text, 'OPERATOR')
+            time1 = '{:.3f}s'.format(time1)
+        time2, *counts2 = measure(text, 'DIRECT', cold=True)
+        time3, *counts3 = measure(text, 'DIRECT')
+        print('{:>6} {:>10} {:>9.3f}s {:>9.3f}s'.format(length, time1,
+                                                        time2, time3),
+              *('{:>7} / {:<7}'.format(*c) for c in zip(counts1, counts2)))
+    rmtree(caches.CACHE_PATH)
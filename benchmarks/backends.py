@@ -0,0 +1,112 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   python3 benchmarks/backends.py [--blender BINARY] [--templates PACK]
+#                                  [--words N] [--workers N]
+#
+# Builds random words of 10 characters through the command line interface
+# with the reference backend (in plain python, with 1 and N worker processes)
+# and, if a blender binary is given, with the blender backend as well. Prints
+# the startup time (an empty word list) and the total time of each run,
+# including the startup of the processes. The template pack has to be
+# extracted first
+# (blender -b ABC.blend --python transition/__main__.py -- --pack).
+
+# Import Python modules
+from sys import executable
+from shutil import rmtree
+from tempfile import mkdtemp
+from random import Random
+from subprocess import call, DEVNULL
+from time import perf_counter
+from argparse import ArgumentParser
+from string import ascii_lowercase
+from os.path import join, dirname, abspath
+
+# Paths of the add-on in the parent folder
+ROOT = dirname(dirname(abspath(__file__)))
+SCRIPT = join(ROOT, 'transition', '__main__.py')
+
+
+#------------------------------------------------------------------------------#
+def words(kerning, count, length=10, seed=0):
+    """
+    Returns random words of length characters, which only contain the pairs
+    of the kerning table.
+    """
+    random = Random(seed)
+    result = []
+    while len(result) < count:
+        word = random.choice(ascii_lowercase)
+        while len(word) < length:
+            char = random.choice(ascii_lowercase)
+            if kerning[ord(word[-1]) - 97][ord(char) - 97] is not None:
+                word += char
+        result.append(word)
+    return result
+
+
+#------------------------------------------------------------------------------#
+def measure(command, filepath):
+    """
+    Runs the command line interface, and returns the elapsed time.
+    """
+    output = mkdtemp()
+    start = perf_counter()
+    call(command + ['--words', filepath, '--out', output, '--format', 'obj',
+                    '--linear'], stdout=DEVNULL)
+    elapsed = perf_counter() - start
+    rmtree(output)
+    return elapsed
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    parser = ArgumentParser(prog='backends.py')
+    parser.add_argument('--blender')
+    parser.add_argument('--templates')
+    parser.add_argument('--words', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    # The add-on can be imported without blender
+    from sys import path
+    path.insert(0, ROOT)
+    from transition.tables import kerning_path, load_kerning
+    kerning, problems = load_kerning(kerning_path())
+    # Write word lists
+    folder = mkdtemp()
+    empty  = join(folder, 'empty.txt')
+    corpus = join(folder, 'words.txt')
+    open(empty, 'w').close()
+    with open(corpus, 'w') as file:
+        file.write('\n'.join(words(kerning, args.words)))
+    # Collect commands
+    reference = [executable, SCRIPT]
+    if args.templates:
+        reference.extend(('--templates', abspath(args.templates)))
+    commands = [('reference', 1, reference),
+                ('reference', args.workers, reference + ['--workers',
+                                                         str(args.workers)])]
+    if args.blender:
+        commands.append(('blender', 1, [args.blender, '-b',
+                                        join(ROOT, 'ABC.blend'), '--python',
+                                        SCRIPT, '--']))
+    # Measure startup and throughput
+    print('{:>10} {:>8} {:>10} {:>10} {:>10}'.format('backend', 'workers',
+                                                    'startup', 'time',
+                                                    'words/s'))
+    for backend, workers, command in commands:
+        startup = measure(command, empty)
+        elapsed = measure(command, corpus)
+        print('{:>10} {:>8} {:>9.3f}s {:>9.3f}s {:>10.1f}'.format(
+                  backend, workers, startup, elapsed, args.words/elapsed))
+    rmtree(folder)
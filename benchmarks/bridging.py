@@ -0,0 +1,186 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   blender -b ABC.blend --python benchmarks/bridging.py
+#   blender ABC.blend --python benchmarks/bridging.py
+#
+# Checks the bridging of every pair of the kerning table: the chain aligned
+# from the index of the template pairs has to be the same as the one aligned
+# by searching every loop against the previous one, and the circular chain
+# of the pair (like 'aba' for 'ab') has to be the same as the one searched
+# after placing the loops around the circle. If blender has a user
+# interface, the faces of the linear and the circular DIRECT results have to
+# be the same as the ones of the OPERATOR results as well. Prints the
+# mismatching pairs (and the worst excess of the cost of bridging the placed
+# loops of the circular ones, the sum of the squared distances of the bridged
+# vertices), and the time spent on aligning with and without the index.
+
+# Import Python modules
+from sys import path
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from string import ascii_lowercase
+from os.path import dirname, abspath
+
+# Import Blender modules
+import bpy
+
+# Import add-on from the parent folder
+path.insert(0, dirname(dirname(abspath(__file__))))
+import transition
+from transition import blender, caches, chains, meshes, tables
+
+
+#------------------------------------------------------------------------------#
+def chain_steps(text, kerning):
+    """
+    Returns the symbols of the transition chain of the text.
+    """
+    steps = []
+    for i, (char1, char2) in enumerate(zip(text, text[1:])):
+        steps.extend(kerning[ord(char1) - 97][ord(char2) - 97][bool(i):])
+    return steps
+
+
+#------------------------------------------------------------------------------#
+def searched(text, kerning, profiles):
+    """
+    Returns the chain of the text, with every loop searched against the
+    previous one.
+    """
+    steps = chain_steps(text, kerning)
+    loops = [(steps[0], list(profiles[steps[0]]))]
+    for step in steps[1:]:
+        profile = profiles[step]
+        order = meshes.bridge_order(loops[-1][1], profile)
+        loops.append((step, [profile[i] for i in order]))
+    return loops
+
+
+#------------------------------------------------------------------------------#
+def placed(loops, distance):
+    """
+    Returns the loops of the chain placed around a circle.
+    """
+    coords, _ = meshes.place_chain(loops, distance, True)
+    size = 3*len(loops[0][1])
+    return [list(zip(*[iter(coords[i:i + size])]*3))
+            for i in range(0, len(coords), size)]
+
+
+def circular_searched(text, kerning, profiles, distance):
+    """
+    Returns the circular chain of the text, with every loop searched against
+    the previous one after placing them around the circle.
+    """
+    steps = chain_steps(text, kerning)
+    loops = placed([(step, profiles[step]) for step in steps], distance)
+    orders = [list(range(len(loops[0])))]
+    for loop1, loop2 in zip(loops, loops[1:]):
+        orders.append(meshes.bridge_order([loop1[i] for i in orders[-1]],
+                                          loop2))
+    return [(step, [profiles[step][i] for i in order])
+            for step, order in zip(steps, orders)]
+
+
+def placed_cost(loops, distance):
+    """
+    Returns the cost of bridging every placed loop of the circular chain to
+    the next one.
+    """
+    loops = placed(loops, distance)
+    return sum((x1 - x2)**2 + (y1 - y2)**2 + (z1 - z2)**2
+               for loop1, loop2 in zip(loops, loops[1:])
+               for (x1, y1, z1), (x2, y2, z2) in zip(loop1, loop2))
+
+
+#------------------------------------------------------------------------------#
+def faces(text, assembly, circular=False):
+    """
+    Builds a linear or circular transition of text and returns its faces as
+    sets of rounded world space vertex coordinates.
+    """
+    bpy.ops.mesh.transition_char_to_char(basetext=text,
+                                         circular=circular,
+                                         subdsurf=0,
+                                         assembly=assembly)
+    # Rename result scene, so the next run will create a new one
+    scene = bpy.data.scenes[text]
+    scene.name = '{}_{}_{}'.format(assembly, 'circular' if circular else
+                                             'linear', text)
+    obj = scene.objects.active
+    verts = [tuple(round(c, 4) for c in obj.matrix_world*v.co)
+             for v in obj.data.vertices]
+    return {frozenset(verts[i] for i in poly.vertices)
+            for poly in obj.data.polygons}
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    transition.register()
+    # Do not touch the cache of the user
+    caches.CACHE_PATH = mkdtemp()
+    kerning, problems = tables.load_kerning(tables.kerning_path())
+    profiles = blender.glyph_profiles(blender.template_objects(), 1, 1)
+    pairs = [c1 + c2 for c1 in ascii_lowercase for c2 in ascii_lowercase
+                     if kerning[ord(c1) - 97][ord(c2) - 97] is not None]
+    # Align all pairs from the index and by searching
+    start = perf_counter()
+    indexed = [chains.word_chain(pair, kerning, 'bridging', lambda: profiles)
+               for pair in pairs]
+    index_time = perf_counter() - start
+    start = perf_counter()
+    search = [searched(pair, kerning, profiles) for pair in pairs]
+    search_time = perf_counter() - start
+    mismatches = [pair for pair, chain1, chain2 in zip(pairs, indexed, search)
+                       if chain1 != chain2]
+    print('{} pairs, indexed: {:.3f}s, searched: {:.3f}s'.format(len(pairs),
+                                                                index_time,
+                                                                search_time))
+    print('{} chains differ:'.format(len(mismatches)), *mismatches)
+    # Compare the circular chains to the ones searched around the circle
+    distance = 2
+    excess   = {}
+    for pair in pairs:
+        text = pair + pair[0]
+        if kerning[ord(pair[1]) - 97][ord(pair[0]) - 97] is None:
+            continue
+        chain1 = chains.word_chain(text, kerning, 'bridging',
+                                   lambda: profiles, True)
+        chain2 = circular_searched(text, kerning, profiles, distance)
+        if chain1 != chain2:
+            cost1 = placed_cost(chain1, distance)
+            cost2 = placed_cost(chain2, distance)
+            excess[pair] = (cost1 - cost2)/(cost2 or 1)
+    print('{} circular chains differ:'.format(len(excess)), *sorted(excess))
+    if excess:
+        worst = max(excess, key=excess.get)
+        print('worst bridging cost excess: {:.2%} ({})'.format(excess[worst],
+                                                              worst))
+    # Compare the meshes to the operator results
+    if bpy.context.screen is None:
+        print('No user interface, the operator results are not compared')
+    else:
+        for circular in (False, True):
+            # Circular pairs need the transition back to the first character
+            texts = [pair for pair in pairs
+                          if not circular or kerning[ord(pair[1]) - 97]
+                                                    [ord(pair[0]) - 97]
+                                             is not None]
+            mismatches = [pair for pair in texts
+                               if faces(pair, 'DIRECT', circular) !=
+                                  faces(pair, 'OPERATOR', circular)]
+            print('{} {} meshes differ:'.format(len(mismatches),
+                                                'circular' if circular else
+                                                'linear'), *mismatches)
+    rmtree(caches.CACHE_PATH)
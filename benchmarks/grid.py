@@ -0,0 +1,56 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   python3 benchmarks/grid.py [BLENDER] [WORKERS ...]
+#
+# Builds the full test grid with the given numbers of blender processes
+# (default: 1 2 4 8) and prints the wall time and the speedup of each run.
+# BLENDER is the path of the blender executable (default: blender).
+
+# Import Python modules
+from sys import argv
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from subprocess import check_call, DEVNULL
+from os.path import join, dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+
+#------------------------------------------------------------------------------#
+def measure(blender, workers):
+    """
+    Returns the wall time of building the full test grid.
+    """
+    out = mkdtemp()
+    try:
+        start = perf_counter()
+        check_call([blender, '-b', join(ROOT, 'ABC.blend'),
+                    '--python', join(ROOT, 'transition', '__main__.py'),
+                    '--', '--grid', '--out', out, '--workers', str(workers)],
+                   stdout=DEVNULL)
+        return perf_counter() - start
+    finally:
+        rmtree(out)
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    args = argv[1:]
+    blender = args.pop(0) if args and not args[0].isdigit() else 'blender'
+    print('{:>7} {:>10} {:>8}'.format('workers', 'time', 'speedup'))
+    base = None
+    for workers in [int(a) for a in args] or (1, 2, 4, 8):
+        elapsed = measure(blender, workers)
+        base = base or elapsed
+        print('{:>7} {:>9.3f}s {:>7.2f}x'.format(workers, elapsed, base/elapsed))
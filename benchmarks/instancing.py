@@ -0,0 +1,103 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   blender -b ABC.blend --python benchmarks/instancing.py -- [FILE]
+#
+# Builds the words of a real text (default: the license of the add-on) in
+# one batch along lines, then only its distinct words, and prints the number
+# of objects and meshes created and the elapsed times. The difference of the
+# objects and the meshes is the number of instanced repeated words, and the
+# estimated time without instancing is the time of the distinct words scaled
+# up to all the words. Only repeated words are instanced, different words
+# share the aligned spans of their common character pairs, so the number of
+# pairs and of their distinct spans is printed as well.
+
+# Import Python modules
+from re import findall
+from sys import argv, path
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from itertools import takewhile
+from os.path import dirname, abspath
+
+# Import Blender modules
+import bpy
+
+# Import add-on from the parent folder
+path.insert(0, dirname(dirname(abspath(__file__))))
+import transition
+from transition import caches, chains, tables
+
+
+#------------------------------------------------------------------------------#
+def license_text():
+    """
+    Returns the license in the header of the add-on.
+    """
+    with open(transition.__file__) as file:
+        return ' '.join(line.strip('# \n')
+                        for line in takewhile(lambda l: l.startswith('#'), file))
+
+
+#------------------------------------------------------------------------------#
+def measure(words, name):
+    """
+    Builds the words into one scene, and returns the elapsed time and the
+    number of new objects and meshes.
+    """
+    objects = len(bpy.data.objects)
+    meshes  = len(bpy.data.meshes)
+    scenes  = set(bpy.data.scenes.keys())
+    start = perf_counter()
+    bpy.ops.mesh.transition_char_to_char(basetext=' '.join(words),
+                                         circular=False,
+                                         wordlist='LINES')
+    elapsed = perf_counter() - start
+    # Rename result scene, so the next run will create a new one (blender
+    # cuts the names to 63 characters, so it is found as the new scene)
+    bpy.data.scenes[(set(bpy.data.scenes.keys()) - scenes).pop()].name = name
+    return (elapsed, len(bpy.data.objects) - objects,
+                     len(bpy.data.meshes) - meshes)
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    transition.register()
+    # Do not touch the cache of the user
+    caches.CACHE_PATH = mkdtemp()
+    args = argv[argv.index('--') + 1:] if '--' in argv else []
+    if args:
+        with open(args[0]) as file:
+            text = file.read()
+    else:
+        text = license_text()
+    # Keep the words which can be built
+    kerning, problems = tables.load_kerning(tables.kerning_path())
+    words = [word for word in findall('[a-z]+', text.lower())
+                  if all(kerning[ord(c1) - 97][ord(c2) - 97] is not None
+                         for c1, c2 in zip(word, word[1:]))]
+    distinct = sorted(set(words))
+    # Build the distinct words first, so both runs start with warm spans
+    unique_time, _, _ = measure(distinct, 'distinct')
+    all_time, objects, meshes = measure(words, 'all')
+    estimate = unique_time*len(words)/len(distinct)
+    print('{} words, {} distinct'.format(len(words), len(distinct)))
+    print('{} objects, {} meshes, {} repeated words instanced'.format(
+              objects, meshes, objects - meshes))
+    pairs = sum(len(word) - 1 for word in distinct)
+    print('{} pairs in the distinct words, {} distinct spans aligned'.format(
+              pairs, len(chains._words['spans'])))
+    print('all: {:.3f}s, distinct: {:.3f}s, without instancing: ~{:.3f}s '
+          '({:.3f}s saved)'.format(all_time, unique_time, estimate,
+                                   estimate - all_time))
+    rmtree(caches.CACHE_PATH)
@@ -0,0 +1,109 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   blender -b --python benchmarks/kerning.py -- [REPEAT]
+#
+# Compares loading the kerning table with json.load against the compiled
+# table (cold, cached in memory and stored in the cache folder), and resolving every
+# pair of a random text with the dictionary and with the compiled table.
+
+# Import Python modules
+from sys import argv, path
+from os import remove
+from json import load
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from os.path import dirname, abspath, join, isfile
+
+# Import add-on from the parent folder and the helpers of the benchmarks
+path.insert(0, dirname(dirname(abspath(__file__))))
+path.insert(0, dirname(abspath(__file__)))
+from transition import caches, tables
+from words import randtext
+
+KERNING = join(dirname(dirname(abspath(__file__))), 'kerning.json')
+# Compiled table stored in the cache folder of the benchmark
+BINARY  = None
+
+
+#------------------------------------------------------------------------------#
+def timeit(function, repeat):
+    """
+    Returns the average time of calling function.
+    """
+    start = perf_counter()
+    for i in range(repeat):
+        function()
+    return (perf_counter() - start)/repeat
+
+
+#------------------------------------------------------------------------------#
+def json_load():
+    with open(KERNING) as file:
+        return load(file)
+
+def compiled_cold():
+    tables._kernings.clear()
+    if isfile(BINARY):
+        remove(BINARY)
+    return tables.load_kerning(KERNING, binary=False)
+
+def compiled_binary():
+    tables._kernings.clear()
+    return tables.load_kerning(KERNING)
+
+def compiled_cached():
+    return tables.load_kerning(KERNING)
+
+
+#------------------------------------------------------------------------------#
+def dict_lookup(kerning, text):
+    steps = 0
+    for char1, char2 in zip(text, text[1:]):
+        try:
+            steps += len(kerning[char1][char2])
+        except KeyError:
+            steps += len(kerning[char2][char1][::-1])
+    return steps
+
+def table_lookup(kerning, text):
+    steps = 0
+    for char1, char2 in zip(text, text[1:]):
+        steps += len(kerning[ord(char1) - 97][ord(char2) - 97])
+    return steps
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    args = argv[argv.index('--') + 1:] if '--' in argv else []
+    repeat = int(args[0]) if args else 100
+    # Do not touch the cache of the user
+    caches.CACHE_PATH = mkdtemp()
+    BINARY = tables.kerning_cache(KERNING)
+    # Make sure the stored table exists for the binary benchmark
+    compiled_cold()
+    tables.load_kerning(KERNING)
+    print('{:<24} {:>12}'.format('load', 'time'))
+    for function in (json_load, compiled_cold, compiled_binary, compiled_cached):
+        print('{:<24} {:>10.3f}ms'.format(function.__name__,
+                                          timeit(function, repeat)*1000))
+    # Random text without the missing transitions of the table
+    text = randtext(100000)
+    print('{:<24} {:>12}'.format('lookup (100000 chars)', 'time'))
+    kerning = json_load()
+    table = tables.load_kerning(KERNING)[0]
+    for function, data in ((dict_lookup, kerning), (table_lookup, table)):
+        print('{:<24} {:>10.3f}ms'.format(function.__name__,
+                                          timeit(lambda: function(data, text),
+                                                 max(1, repeat//10))*1000))
+    rmtree(caches.CACHE_PATH)
@@ -0,0 +1,89 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   blender -b ABC.blend --python benchmarks/keystrokes.py -- [LENGTH]
+#
+# Simulates typing a random text of LENGTH (default: 200) characters into the
+# Text field one character at a time, along a line and around a circle, and
+# prints the latency of rebuilding the transition at every 10th character
+# from scratch (without the chain of the previous text and the aligned spans
+# in memory and on disk) and incrementally. Around a circle every letter
+# changes the angle between the profiles, so only the aligned spans can be
+# reused, and the prefixes which cannot be closed into a circle are skipped
+# (a single letter cannot be built along a line, so typing starts from two).
+
+# Import Python modules
+from sys import argv, path
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter
+from os.path import dirname, abspath
+
+# Import Blender modules
+import bpy
+
+# Import add-on from the parent folder and the helpers of the benchmarks
+path.insert(0, dirname(dirname(abspath(__file__))))
+path.insert(0, dirname(abspath(__file__)))
+import transition
+from transition import caches, chains, tables
+from words import missing_pairs, randtext
+
+
+#------------------------------------------------------------------------------#
+def measure(text, circular, incremental):
+    """
+    Returns the elapsed time of building the transition of text.
+    """
+    if not incremental:
+        chains._words['stamp'] = None
+        rmtree(caches.CACHE_PATH, ignore_errors=True)
+    scenes = set(bpy.data.scenes.keys())
+    start = perf_counter()
+    bpy.ops.mesh.transition_char_to_char(basetext=text,
+                                         circular=circular,
+                                         assembly='DIRECT')
+    elapsed = perf_counter() - start
+    # Rename result scene, so the next run will create a new one (blender
+    # cuts the names to 63 characters, so it is found as the new scene)
+    name = (set(bpy.data.scenes.keys()) - scenes).pop()
+    bpy.data.scenes[name].name = '{}_{}_{}'.format(circular, incremental,
+                                                   len(text))
+    return elapsed
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    transition.register()
+    # Do not touch the cache of the user
+    caches.CACHE_PATH = mkdtemp()
+    args = argv[argv.index('--') + 1:] if '--' in argv else []
+    text = randtext(int(args[0]) if args else 200, circular=True)
+    missing = missing_pairs(tables.load_kerning(tables.kerning_path())[0])
+    print('{:>6} {:>9} {:>12} {:>12}'.format('chars', 'path', 'full',
+                                             'incremental'))
+    for circular in (False, True):
+        previous = None
+        for length in range(2, len(text) + 1):
+            if circular and text[length - 1] + text[0] in missing:
+                continue
+            full = measure(text[:length], circular, False)
+            # Previous text has to be the last shorter one which can be built
+            if previous:
+                measure(previous, circular, True)
+            incremental = measure(text[:length], circular, True)
+            previous = text[:length]
+            if not length%10:
+                print('{:>6} {:>9} {:>10.3f}ms {:>10.3f}ms'.format(
+                          length, 'circular' if circular else 'linear',
+                          full*1000, incremental*1000))
+    rmtree(caches.CACHE_PATH)
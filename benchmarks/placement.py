@@ -0,0 +1,116 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   blender ABC.blend --python benchmarks/placement.py -- [COUNT ...]
+#
+# Compares the per-object transform.rotate loop with the computed placement on
+# the given number of objects (default: 10 100 1000) and prints the results to
+# stdout. The rotate operator needs a 3D View, so blender can not run in
+# background mode here.
+
+# Import Python modules
+from sys import argv, path
+from math import pi
+from time import perf_counter
+from os.path import dirname, abspath
+
+# Import Blender modules
+import bpy
+
+# Import add-on from the parent folder
+path.insert(0, dirname(dirname(abspath(__file__))))
+from transition import blender
+
+
+#------------------------------------------------------------------------------#
+def view3d():
+    """
+    Returns a context override of the first 3D View.
+    """
+    for area in bpy.context.screen.areas:
+        if area.type == 'VIEW_3D':
+            for region in area.regions:
+                if region.type == 'WINDOW':
+                    return {'area': area, 'region': region}
+
+
+#------------------------------------------------------------------------------#
+def circles(scene, count):
+    """
+    Links count new objects sharing the mesh of the circle to the scene.
+    """
+    circle = bpy.data.objects['_circle']
+    objects = []
+    for i in range(count):
+        obj = bpy.data.objects.new('_circle_', circle.data)
+        scene.objects.link(obj)
+        objects.append(obj)
+    return objects
+
+
+#------------------------------------------------------------------------------#
+def operator(scene, objects, location, pivot, angle, axis):
+    """
+    The original placement: one rotate operator for each object.
+    """
+    override = view3d()
+    override['area'].spaces.active.pivot_point = 'CURSOR'
+    scene.cursor_location = pivot
+    rotation = angle/len(objects)
+    for obj in objects:
+        obj.location = location
+        obj.select = False
+    for i, obj in enumerate(objects):
+        obj.select = True
+        bpy.ops.transform.rotate(override, value=i*rotation, axis=axis)
+        obj.select = False
+
+
+#------------------------------------------------------------------------------#
+def direct(scene, objects, location, pivot, angle, axis):
+    """
+    The computed placement: all matrices at once.
+    """
+    matrices = blender.arc_matrices(objects, location, pivot, angle, axis)
+    for obj, matrix in zip(objects, matrices):
+        obj.matrix_basis = matrix
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    scene = bpy.context.scene
+    for obj in scene.objects:
+        obj.select = False
+    counts = [int(a) for a in argv[argv.index('--') + 1:]] if '--' in argv else []
+    args = (0, 0, 0), (2, 0, 0), 2*pi, (0, 0, 1)
+    print('{:>6} {:>10} {:>10} {:>10}'.format('count', 'OPERATOR',
+                                              'DIRECT', 'deviation'))
+    for count in counts or (10, 100, 1000):
+        results = []
+        for place in (operator, direct):
+            objects = circles(scene, count)
+            start = perf_counter()
+            place(scene, objects, *args)
+            results.append((perf_counter() - start, objects))
+        scene.update()
+        # Largest distance between the same objects of the two placements
+        deviation = max((o1.matrix_world.translation -
+                         o2.matrix_world.translation).length
+                        for o1, o2 in zip(results[0][1], results[1][1]))
+        print('{:>6} {:>9.3f}s {:>9.3f}s {:>10.6f}'.format(count,
+                                                           results[0][0],
+                                                           results[1][0],
+                                                           deviation))
+        for _, objects in results:
+            for obj in objects:
+                scene.objects.unlink(obj)
+                bpy.data.objects.remove(obj)
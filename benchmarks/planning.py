@@ -0,0 +1,72 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   blender -b --python benchmarks/planning.py -- [MEGABYTES ...]
+#
+# Plans the segments of random corpora of the given sizes (default: 1 2 4 MB,
+# one word of 3 to 12 characters per line) along a line and around a circle,
+# word by word and all at once (which uses numpy if it is installed), and
+# prints the throughput and the size of the serialised plans to stdout.
+
+# Import Python modules
+from sys import argv, path
+from time import perf_counter
+from random import Random
+from os.path import dirname, abspath
+
+# Import add-on and helpers from the parent and this folder
+path.insert(0, dirname(dirname(abspath(__file__))))
+path.insert(0, dirname(abspath(__file__)))
+from transition import chains, tables
+from words import randtext
+
+
+#------------------------------------------------------------------------------#
+def corpus(size, seed=0):
+    """
+    Returns random words of at least size characters in total, which can be
+    closed into circles as well.
+    """
+    random = Random(seed)
+    words  = []
+    length = 0
+    while length < size:
+        words.append(randtext(random.randint(3, 12), random.random(), True))
+        length += len(words[-1]) + 1
+    return words
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    kerning, problems = tables.load_kerning(tables.kerning_path())
+    sizes = [float(a) for a in argv[argv.index('--') + 1:]] if '--' in argv else []
+    print('{:>6} {:>9} {:>7} {:>10} {:>10} {:>12} {:>10}'.format(
+              'MB', 'path', 'method', 'time', 'MB/s', 'segments/s', 'plan MB'))
+    for size in sizes or (1, 2, 4):
+        words = corpus(int(size*1024*1024))
+        for circular in (False, True):
+            for method in ('each', 'all'):
+                start = perf_counter()
+                if method == 'each':
+                    plan = chains.SegmentPlan()
+                    for word in words:
+                        chains.plan_text(word, kerning, 2, 1, 1, circular,
+                                         plan)
+                else:
+                    plan = chains.plan_words(words, kerning, 2, 1, 1,
+                                             circular)
+                elapsed = perf_counter() - start
+                print('{:>6} {:>9} {:>7} {:>9.3f}s {:>10.3f} {:>12.0f} '
+                      '{:>10.3f}'.format(size, 'circular' if circular else
+                                               'linear', method, elapsed,
+                                         size/elapsed, len(plan)/elapsed,
+                                         len(plan.tobytes())/1024/1024))
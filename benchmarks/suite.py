@@ -0,0 +1,336 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   blender -b --python benchmarks/suite.py -- [OPTIONS]
+#   python3 benchmarks/suite.py [OPTIONS]        (with the bpy module)
+#
+# Runs the benchmark cases, each of them in a fresh process with an empty span
+# cache, so their timings and memory peaks do not depend on each other:
+#
+#   words/<layout>/<assembly>/<length>  builds a corpus of random words
+#   batch/<layout>/<words>              builds random words into one scene
+#   grid/c<vars_col>/s<subdsurf>        builds the full test grid
+#   kerning/<pairs>                     loads the table and looks up pairs
+#
+# Every case records the wall time (median of the repeats), the peak resident
+# memory, the number of new objects and meshes, and the vertices and faces of
+# the subdivided results. The OPERATOR assembly can only be measured when
+# blender has a user interface, otherwise its cases are marked as skipped.
+# The random words only contain the transitions of the kerning table (and the
+# circular ones can be closed as well).
+#
+# Options:
+#   --output FILE       write the results as JSON into FILE
+#   --baseline FILE     compare the results to an earlier output, and exit with
+#                       1 if any case got slower, bigger or produced different
+#                       geometry
+#   --tolerance RATIO   allowed relative growth of time and memory (0.1)
+#   --repeat N          number of runs of each case (3)
+#   --filter TEXT       run only the cases whose names contain TEXT
+
+# Import Python modules
+from sys import argv, exit, executable, path, platform, version
+from json import load, loads, dump, dumps
+from shutil import rmtree
+from tempfile import mkdtemp
+from statistics import median
+from subprocess import Popen, PIPE
+from time import perf_counter, strftime
+from argparse import ArgumentParser, SUPPRESS
+from os.path import join, dirname, abspath
+try:
+    from resource import getrusage, RUSAGE_SELF
+except ImportError:
+    getrusage = None
+
+# Import Blender modules
+import bpy
+
+# Import add-on and helpers from the parent and this folder
+ROOT = dirname(dirname(abspath(__file__)))
+BLEND = join(ROOT, 'ABC.blend')
+path.insert(0, ROOT)
+path.insert(0, dirname(abspath(__file__)))
+from words import randtext, missing_pairs
+import transition
+from transition import caches, tables
+
+# Number of words in each corpus and their lengths
+WORDS   = 5
+LENGTHS = (10, 100, 1000)
+# Number of words built in one batch
+BATCH = 100
+# Layouts and subdivision levels of the test grid
+GRIDS = ((5, 0), (15, 0), (15, 3))
+# Number of looked up kerning pairs
+PAIRS = 100000
+
+
+#------------------------------------------------------------------------------#
+def cases():
+    """
+    Returns the names of all benchmark cases.
+    """
+    names = []
+    for layout in ('linear', 'circular'):
+        for assembly in ('DIRECT', 'OPERATOR'):
+            for length in LENGTHS:
+                names.append('words/{}/{}/{}'.format(layout, assembly, length))
+    for layout in ('grid', 'lines'):
+        names.append('batch/{}/{}'.format(layout, BATCH))
+    for vars_col, subdsurf in GRIDS:
+        names.append('grid/c{}/s{}'.format(vars_col, subdsurf))
+    names.append('kerning/{}'.format(PAIRS))
+    return names
+
+
+#------------------------------------------------------------------------------#
+def peak_rss():
+    """
+    Returns the peak resident memory of the process in MiB, or None if it
+    cannot be measured on this platform.
+    """
+    if getrusage is None:
+        return None
+    # ru_maxrss is in bytes on OS X and in kilobytes everywhere else
+    return getrusage(RUSAGE_SELF).ru_maxrss/(1 << (20 if platform == 'darwin'
+                                                       else 10))
+
+
+#------------------------------------------------------------------------------#
+def geometry(scenes):
+    """
+    Returns the number of vertices and faces of the meshes in the given scenes,
+    with their modifiers applied.
+    """
+    verts = faces = 0
+    for scene in scenes:
+        for obj in scene.objects:
+            if obj.type != 'MESH':
+                continue
+            mesh = obj.to_mesh(scene, True, 'RENDER')
+            verts += len(mesh.vertices)
+            faces += len(mesh.polygons)
+            bpy.data.meshes.remove(mesh)
+    return verts, faces
+
+
+#------------------------------------------------------------------------------#
+def run(name):
+    """
+    Runs a single case in the current process, and returns its measurements.
+    """
+    kind, *params = name.split('/')
+    # Open the templates, if they are not the current file
+    if abspath(bpy.data.filepath) != BLEND:
+        bpy.ops.wm.open_mainfile(filepath=BLEND)
+    transition.register()
+    # Do not touch (or start from) the cache of the user
+    caches.CACHE_PATH = mkdtemp()
+    scenes  = set(bpy.data.scenes)
+    objects = len(bpy.data.objects)
+    meshes  = len(bpy.data.meshes)
+    result  = {'rss_base': peak_rss()}
+    # Words are built from the transitions of the table, which is forgotten
+    # afterwards, so loading it is measured by the cases as well
+    if kind in ('words', 'batch'):
+        missing = missing_pairs(tables.load_kerning(
+                                tables.kerning_path())[0])
+        tables._kernings.clear()
+    try:
+        # Build a corpus of words
+        if kind == 'words':
+            layout, assembly, length = params
+            if assembly == 'OPERATOR' and bpy.context.screen is None:
+                return {'skipped': 'no user interface'}
+            corpus = [randtext(int(length), seed, layout == 'circular', missing)
+                      for seed in range(WORDS)]
+            start = perf_counter()
+            for word in corpus:
+                bpy.ops.mesh.transition_char_to_char(basetext=word,
+                                                     circular=layout == 'circular',
+                                                     assembly=assembly)
+            result['seconds'] = perf_counter() - start
+        # Build a corpus of words in one batch
+        elif kind == 'batch':
+            layout, words = params
+            # Batches are circular
+            corpus = [randtext(10, seed, True, missing)
+                      for seed in range(int(words))]
+            start = perf_counter()
+            bpy.ops.mesh.transition_char_to_char(basetext=' '.join(corpus),
+                                                 wordlist=layout.upper())
+            result['seconds'] = perf_counter() - start
+            result['words_per_second'] = len(corpus)/result['seconds']
+        # Build the test grid
+        elif kind == 'grid':
+            vars_col, subdsurf = int(params[0][1:]), int(params[1][1:])
+            start = perf_counter()
+            # Only an empty text builds the grid
+            bpy.ops.mesh.transition_char_to_char(basetext='',
+                                                 update_g=True,
+                                                 vars_col=vars_col,
+                                                 subdsurf=subdsurf)
+            result['seconds'] = perf_counter() - start
+        # Load the kerning table and resolve the pairs of a text
+        elif kind == 'kerning':
+            text = randtext(int(params[0]) + 1)
+            pairs = [(ord(c1) - 97, ord(c2) - 97) for c1, c2 in zip(text, text[1:])]
+            start = perf_counter()
+            kerning, problems = tables.load_kerning(tables.kerning_path(),
+                                                    binary=False)
+            for c1, c2 in pairs:
+                kerning[c1][c2]
+            result['seconds'] = perf_counter() - start
+        else:
+            raise ValueError('Unknown benchmark case: {}'.format(name))
+    finally:
+        rmtree(caches.CACHE_PATH)
+    result['rss_peak'] = peak_rss()
+    result['objects'] = len(bpy.data.objects) - objects
+    result['meshes'] = len(bpy.data.meshes) - meshes
+    result['verts'], result['faces'] = geometry(set(bpy.data.scenes) - scenes)
+    return result
+
+
+#------------------------------------------------------------------------------#
+def spawn(name):
+    """
+    Runs a single case in a new process, and returns its measurements.
+    """
+    # If this is blender, start a new blender, otherwise a new python
+    if bpy.app.binary_path:
+        command = [bpy.app.binary_path, '-b', BLEND,
+                   '--python', abspath(__file__), '--', '--case', name]
+    else:
+        command = [executable, abspath(__file__), '--case', name]
+    process = Popen(command, stdout=PIPE, universal_newlines=True)
+    result = None
+    for line in process.stdout:
+        if line.startswith('RESULT: '):
+            result = loads(line[8:])
+    process.wait()
+    if result is None:
+        raise RuntimeError('Benchmark case {} failed with exit code '
+                           '{}'.format(name, process.returncode))
+    return result
+
+
+#------------------------------------------------------------------------------#
+def measure(name, repeat):
+    """
+    Runs a case repeatedly, and returns the median of its times and the maximum
+    of its memory peaks.
+    """
+    runs = [spawn(name) for i in range(repeat)]
+    result = runs[0]
+    if 'skipped' not in result:
+        result['seconds'] = median(r['seconds'] for r in runs)
+        if 'words_per_second' in result:
+            result['words_per_second'] = median(r['words_per_second']
+                                                for r in runs)
+        if result['rss_peak'] is not None:
+            result['rss_peak'] = max(r['rss_peak'] for r in runs)
+    return result
+
+
+#------------------------------------------------------------------------------#
+def compare(results, baseline, tolerance):
+    """
+    Returns the descriptions of the regressions of results to baseline.
+    """
+    regressions = []
+    for name, new in sorted(results.items()):
+        try:
+            old = baseline[name]
+        except KeyError:
+            continue
+        if 'skipped' in new or 'skipped' in old:
+            continue
+        # Time and memory are allowed to grow within the tolerance
+        for key in ('seconds', 'rss_peak'):
+            if new[key] is None or old[key] is None:
+                continue
+            if new[key] > old[key]*(1 + tolerance):
+                regressions.append('{}: {} {:.3f} -> {:.3f} '
+                                   '(+{:.1%})'.format(name, key, old[key],
+                                                      new[key],
+                                                      new[key]/old[key] - 1))
+        # The produced geometry has to be exactly the same
+        for key in ('objects', 'meshes', 'verts', 'faces'):
+            if new[key] != old[key]:
+                regressions.append('{}: {} {} -> {}'.format(name, key,
+                                                           old[key], new[key]))
+    return regressions
+
+
+#------------------------------------------------------------------------------#
+def main(args):
+    """
+    Runs the benchmark cases, and returns the exit code.
+    """
+    parser = ArgumentParser(prog='suite.py')
+    parser.add_argument('--case', help=SUPPRESS)
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--filter', default='')
+    args = parser.parse_args(args)
+    # If this is a worker process, run a single case, and report it
+    if args.case:
+        print('RESULT: ' + dumps(run(args.case)))
+        return 0
+
+    # Run all the selected cases
+    results = {}
+    print('{:<28} {:>10} {:>10} {:>8} {:>8} {:>10} {:>10}'.format('case',
+                                                                  'time',
+                                                                  'peak MiB',
+                                                                  'objects',
+                                                                  'meshes',
+                                                                  'verts',
+                                                                  'faces'))
+    for name in cases():
+        if args.filter not in name:
+            continue
+        results[name] = result = measure(name, args.repeat)
+        if 'skipped' in result:
+            print('{:<28} skipped: {}'.format(name, result['skipped']))
+            continue
+        print('{:<28} {:>9.3f}s {:>10} {objects:>8} {meshes:>8} {verts:>10} '
+              '{faces:>10}'.format(name, result['seconds'],
+                                   '-' if result['rss_peak'] is None else
+                                   '{:.1f}'.format(result['rss_peak']),
+                                   **result))
+    # Write results
+    if args.output:
+        with open(args.output, 'w') as file:
+            dump({'blender': bpy.app.version_string,
+                  'python': version,
+                  'platform': platform,
+                  'date': strftime('%Y-%m-%d %H:%M:%S'),
+                  'repeat': args.repeat,
+                  'cases': results}, file, indent=4, sort_keys=True)
+    # Compare to the baseline
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, load(file)['cases'], args.tolerance)
+        for regression in regressions:
+            print('REGRESSION:', regression)
+        return 1 if regressions else 0
+    return 0
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    exit(main(argv[argv.index('--') + 1:] if '--' in argv else argv[1:]))
@@ -0,0 +1,90 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Usage:
+#   python3 benchmarks/winding.py [--templates PACK] [WORD ...]
+#
+# Checks the faces of mirrored instances the way mesh_data exports them: the
+# circular results of the words (default: a few random ones) are built with
+# the reference backend, then placed once as they are and once mirrored by
+# each combination of the axes (the matrices with negative determinants turn
+# the faces inside out). The signed volume of every closed placed copy has to
+# be the same as the one of the result, which only holds if the faces of the
+# mirrored copies are reversed. Prints the failing words and mirrors, and
+# exits with 1 if there are any.
+
+# Import Python modules
+from sys import path, exit
+from argparse import ArgumentParser
+from os.path import join, dirname, abspath
+
+# Import add-on from the parent folder, and the random texts
+path.insert(0, dirname(dirname(abspath(__file__))))
+path.insert(0, dirname(abspath(__file__)))
+from transition import meshes, packs, reference, tables
+from words import randtext
+
+
+#------------------------------------------------------------------------------#
+def volume(coords, faces):
+    """
+    Returns the signed volume of the closed mesh, positive if its faces are
+    facing outwards.
+    """
+    points = list(zip(*[iter(coords)]*3))
+    total  = 0
+    for face in faces:
+        ax, ay, az = points[face[0]]
+        for i, j in zip(face[1:], face[2:]):
+            (bx, by, bz), (cx, cy, cz) = points[i], points[j]
+            total += (ax*(by*cz - bz*cy) +
+                      ay*(bz*cx - bx*cz) +
+                      az*(bx*cy - by*cx))
+    return total/6
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    parser = ArgumentParser(prog='winding.py')
+    parser.add_argument('--templates')
+    parser.add_argument('words', nargs='*')
+    args = parser.parse_args()
+    kerning, problems = tables.load_kerning(tables.kerning_path())
+    words = args.words or [randtext(5, seed, circular=True)
+                           for seed in range(5)]
+    # The pack of the blend file next to the add-on by default
+    filepath = args.templates or packs.pack_path(
+                   join(dirname(dirname(abspath(__file__))), 'ABC.blend'))
+    backend = reference.ReferenceBackend(packs.read_pack(filepath), None,
+                                         circular=True)
+    failed = 0
+    for word in words:
+        _, coords, faces = backend.build(word, kerning, 0)
+        expected = volume(coords, faces)
+        for mirror in ((sx, sy, sz) for sx in (1, -1)
+                                    for sy in (1, -1)
+                                    for sz in (1, -1)):
+            # Place the result, then its mirrored copy after it, like the
+            # objects of a scene are collected into one mesh
+            placed = list(coords) + [c*s for c, s in zip(coords, mirror*
+                                                          (len(coords)//3))]
+            offset = len(coords)//3
+            placed_faces = (meshes.offset_faces(faces, 0) +
+                            meshes.offset_faces(faces, offset,
+                                                    mirror.count(-1)%2 == 1))
+            placed_volume = volume(placed, placed_faces)
+            if abs(placed_volume - 2*expected) > 1e-3*abs(expected):
+                failed += 1
+                print('{}: mirrored by {}: volume {:.4f} instead of '
+                      '{:.4f}'.format(word, mirror, placed_volume, 2*expected))
+    print('{} words, {} mirrors, {} failed'.format(len(words), 8*len(words),
+                                                   failed))
+    exit(1 if failed else 0)
@@ -0,0 +1,54 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+# Random texts of the benchmarks, kept in a module without blender, so the
+# benchmarks running without it can use them as well
+
+# Import Python modules
+from random import Random
+from string import ascii_lowercase
+
+
+# Transitions missing from the kerning table in the repository
+MISSING = 'gp', 'pg', 'zz'
+
+
+#------------------------------------------------------------------------------#
+def missing_pairs(kerning):
+    """
+    Returns the transitions missing from the compiled kerning table, like 'gp'.
+    """
+    return {char1 + char2
+            for char1, row in zip(ascii_lowercase, kerning)
+            for char2, steps in zip(ascii_lowercase, row)
+            if steps is None}
+
+
+#------------------------------------------------------------------------------#
+def randtext(length, seed=0, circular=False, missing=MISSING):
+    """
+    Returns a random lowercase text with the given length without the missing
+    transitions, which can be closed into a circle as well if circular is
+    True.
+    """
+    random = Random(seed)
+    text = ''
+    while len(text) < length:
+        char = random.choice(ascii_lowercase)
+        # Skip the missing transitions, and the last character if it cannot
+        # be bridged to the first one
+        if (text[-1:] + char) in missing:
+            continue
+        if circular and len(text) == length - 1 and \
+           (char + (text[:1] or char)) in missing:
+            continue
+        text += char
+    return text
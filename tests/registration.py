@@ -0,0 +1,47 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+
+# Usage:
+#   python3 tests/registration.py FOLDER
+#   blender -b --factory-startup --python tests/registration.py -- FOLDER
+#
+# Imports and registers the add-on, and prints the elapsed times and the
+# modules loaded by them. The bytecode cache of the add-on is looked up in
+# the given (empty) folder and is not written, so its source is compiled by
+# the import, like on its first one. Run by test_registration.py.
+
+# Import Python modules (before the measured import, so only the modules it
+# loads are reported)
+import sys
+from sys import argv, modules, path
+from time import perf_counter
+from os.path import dirname, abspath
+
+# Import add-on from the parent folder, without its bytecode cache
+path.insert(0, dirname(dirname(abspath(__file__))))
+sys.dont_write_bytecode = True
+sys.pycache_prefix = argv[-1]
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    loaded = set(modules)
+    start = perf_counter()
+    import transition
+    imported = perf_counter() - start
+    registered = 0
+    if transition.bpy is not None:
+        start = perf_counter()
+        transition.register()
+        registered = perf_counter() - start
+        transition.unregister()
+    print('RESULT:', imported, registered, *sorted(set(modules) - loaded))
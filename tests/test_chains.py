@@ -0,0 +1,155 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+
+# Usage:
+#   python3 -m pytest tests
+#
+# Aligns the transition chains of the kerning table of the add-on with
+# synthetic template profiles, and plans the segments of the words, so the
+# tests run without blender.
+
+# Import Python modules
+from sys import path
+from math import pi, sin, cos
+from shutil import rmtree
+from random import Random
+from tempfile import mkdtemp
+from string import ascii_lowercase
+from unittest import TestCase
+from os.path import join, dirname, abspath
+
+# Import add-on from the parent folder
+ROOT = dirname(dirname(abspath(__file__)))
+path.insert(0, ROOT)
+from transition import caches, chains, meshes, tables
+
+KERNING = join(ROOT, 'kerning.json')
+# Vertices of the synthetic profiles
+SIZE = 8
+
+
+#------------------------------------------------------------------------------#
+def synthetic_profiles(seed=0):
+    """
+    Returns irregular closed loops as the profiles of all templates.
+    """
+    random = Random(seed)
+    def loop():
+        radius, phase = random.uniform(.3, .6), random.uniform(0, 2*pi)
+        return tuple((radius*cos(2*pi*i/SIZE + phase)*random.uniform(.8, 1.2),
+                      random.uniform(-.05, .05),
+                      radius*sin(2*pi*i/SIZE + phase)) for i in range(SIZE))
+    profiles = {0: loop()}
+    for char in ascii_lowercase:
+        profiles[char] = loop()
+        profiles[char.upper()] = loop()
+    return profiles
+
+
+#------------------------------------------------------------------------------#
+def random_words(kerning, count, seed=0):
+    """
+    Returns random words of 3 to 12 letters, which only contain the existing
+    transitions of the kerning table and can be closed into circles.
+    """
+    random = Random(seed)
+    def exists(char1, char2):
+        return kerning[ord(char1) - 97][ord(char2) - 97] is not None
+    words = []
+    while len(words) < count:
+        word = random.choice(ascii_lowercase)
+        for i in range(random.randint(2, 11)):
+            word += random.choice([char for char in ascii_lowercase
+                                        if exists(word[-1], char)])
+        if exists(word[-1], word[0]):
+            words.append(word)
+    return words
+
+
+#------------------------------------------------------------------------------#
+class TestWordChain(TestCase):
+
+    def setUp(self):
+        self.cache = caches.CACHE_PATH
+        caches.CACHE_PATH = mkdtemp()
+        chains._words['stamp'] = None
+        self.kerning, _ = tables.load_kerning(KERNING, binary=False)
+        self.profiles = synthetic_profiles()
+
+    def tearDown(self):
+        rmtree(caches.CACHE_PATH)
+        caches.CACHE_PATH = self.cache
+        chains._words['stamp'] = None
+
+    def symbols(self, text, kerning, circular=False):
+        return [step for step, _ in chains.word_chain(text, kerning, 'test',
+                                                      lambda: self.profiles,
+                                                      circular)]
+
+    def test_changed_kerning(self):
+        # The same stamp with edited steps of a pair already seen
+        kerning = [list(row) for row in self.kerning]
+        kerning[0][1] = ('A', 'a', 'b', 'B')
+        for circular in (False, True):
+            self.symbols('ab', self.kerning, circular)
+            self.assertEqual(self.symbols('ab', kerning, circular),
+                             ['A', 'a', 'b', 'B'])
+            self.assertEqual(self.symbols('ab', self.kerning, circular),
+                             list(self.kerning[0][1]))
+
+
+#------------------------------------------------------------------------------#
+class TestSegmentPlan(TestCase):
+
+    def setUp(self):
+        self.kerning, _ = tables.load_kerning(KERNING, binary=False)
+        self.words = random_words(self.kerning, 50)
+
+    def plan(self, text, circular=False):
+        return chains.plan_text(text, self.kerning, 2, .5, .75, circular)
+
+    def test_plan_words(self):
+        # With numpy (if it is installed) and without it
+        numpy = meshes.numpy_module()
+        try:
+            for module in {numpy, None}:
+                meshes._numpy[:] = [module]
+                for circular in (False, True):
+                    expected = chains.SegmentPlan()
+                    for word in self.words:
+                        chains.plan_text(word, self.kerning, 2, .5, .75,
+                                         circular, expected)
+                    self.assertEqual(chains.plan_words(self.words,
+                                                       self.kerning, 2, .5,
+                                                       .75, circular),
+                                     expected)
+        finally:
+            meshes._numpy[:] = [numpy]
+
+    def test_bytes(self):
+        for circular in (False, True):
+            plan = chains.plan_words(self.words, self.kerning, 2, .5, .75,
+                                     circular)
+            self.assertEqual(chains.SegmentPlan.frombytes(plan.tobytes()),
+                             plan)
+        with self.assertRaises(ValueError):
+            chains.SegmentPlan.frombytes(b'TRS4' + bytes(4))
+
+    def test_diff(self):
+        plan1 = self.plan('jewel')
+        plan2 = self.plan('jewer')
+        self.assertEqual(plan1.diff(self.plan('jewel')), [])
+        # The segments of the common beginning are kept, everything after the
+        # changed letter is different or new
+        expected = list(range(len(self.plan('jewe')), len(plan2)))
+        self.assertEqual(plan1.diff(plan2), expected)
+        self.assertEqual(plan2.diff(plan1), expected)
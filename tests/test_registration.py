@@ -0,0 +1,80 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# See the full license text in transition/__init__.py                         #
+#                                                                              #
+################################################################################
+
+
+# Usage:
+#   python3 -m pytest tests
+#
+# Enabling the add-on (and so starting blender with it) has to stay within
+# the budget: importing and registering it may not load the machinery which
+# generates the transitions. Measured in plain python, and in blender if its
+# binary is found (on the PATH, or in the BLENDER environment variable).
+
+# Import Python modules
+from sys import executable
+from shutil import which
+from statistics import median
+from subprocess import check_output, DEVNULL
+from tempfile import TemporaryDirectory
+from unittest import TestCase, skipUnless
+from os import environ
+from os.path import join, dirname, abspath
+
+# Script importing and registering the add-on in a fresh process
+SCRIPT = join(dirname(abspath(__file__)), 'registration.py')
+# Blender binary, or None if it is not installed
+BLENDER = environ.get('BLENDER') or which('blender')
+# Budget of importing and registering the add-on in seconds, and the number of
+# fresh processes the median of them is measured in
+BUDGET = 0.025
+RUNS   = 5
+# Modules which are only imported when the transitions are generated
+LAZY = ('json', 'hashlib', 'mmap', 'cProfile', 'threading', 'multiprocessing',
+        'subprocess', 'argparse', 'numpy')
+
+
+#------------------------------------------------------------------------------#
+def measure(command):
+    """
+    Runs the command in fresh processes, and returns the median times of the
+    import and the registration, and the machinery loaded by them.
+    """
+    times = []
+    eager = set()
+    for i in range(RUNS):
+        with TemporaryDirectory() as folder:
+            output = check_output(command + [folder], stderr=DEVNULL,
+                                  universal_newlines=True)
+        result = next(line.split()[1:] for line in output.splitlines()
+                                       if line.startswith('RESULT:'))
+        times.append((float(result[0]), float(result[1])))
+        eager.update(name for name in result[2:]
+                          if name.startswith('transition.') or
+                             name.split('.')[0] in LAZY)
+    return (median(t[0] for t in times), median(t[1] for t in times),
+            sorted(eager))
+
+
+#------------------------------------------------------------------------------#
+class TestRegistration(TestCase):
+
+    def test_python(self):
+        imported, registered, eager = measure([executable, SCRIPT])
+        self.assertEqual(eager, [])
+        self.assertLess(imported, BUDGET)
+
+    @skipUnless(BLENDER, 'blender is not installed')
+    def test_blender(self):
+        imported, registered, eager = measure([BLENDER, '-b',
+                                               '--factory-startup',
+                                               '--python', SCRIPT, '--'])
+        self.assertEqual(eager, [])
+        self.assertLess(imported + registered, BUDGET)
@@ -0,0 +1,429 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# The add-on only defines its operators here, the machinery generating the
+# transitions lives in the modules next to this one, which are imported when
+# an operator is first executed, so enabling the add-on (and starting blender
+# with it) stays fast:
+#   profiling: stages and counters of the profiled executions
+#   tables:    the kerning table and its compiled binary cache
+#   caches:    the aligned spans of the words on disk
+#   chains:    alignment, placement and planning of the segments of the words
+#   meshes:    bridging, subdivision, levels of detail and mesh file writers
+#   packs:     the geometry of the templates extracted from the blend file
+#   blender:   the blender backend
+#   reference: the reference backend, which runs without blender
+#   cli:       the command line interface (see __main__.py)
+
+# Import Python modules
+from os import environ
+from sys import modules
+from time import perf_counter
+
+# Import Blender modules (if this is not blender, only the reference backend
+# and the functions independent of blender can be used)
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# Module information
+bl_info = {'name'       : 'Transition Character to Character',
+           'author'     : 'Peter Varo',
+           'version'    : (1, 4, 4),
+           'blender'    : (2, 70, 0),
+           'location'   : 'View3D > Add > Mesh',
+           'description': ('Generates all kinds of character to character '
+                           'transitions based on existing blender data.'),
+           'warning'    : '',
+           'category'   : 'Add Mesh'}
+
+
+#------------------------------------------------------------------------------#
+# The operator can only be defined if blender is available
+if bpy is not None:
+    class TransitionProperties:
+        """
+        Properties shared by the character to character transition operators.
+        """
+        # Operator GUI properties
+        basetext = bpy.props.StringProperty(name='Text',
+                                            default='jewellery',
+                                            description='If not provided, operator '
+                                                        'will build test transitions')
+        distance = bpy.props.FloatProperty(name="Distance or Radius",
+                                           default=2,
+                                           min=.1, max=100,
+                                           description='If operator is in test mode '
+                                                       'and Circular property is OFF '
+                                                       'this will be the distance '
+                                                       'between the characters and/or '
+                                                       'transitions. If Circular is ON '
+                                                       'this will be the radius of the '
+                                                       'arc or the full circle')
+        circular = bpy.props.BoolProperty(name='Circular Transition',
+                                          default=True,
+                                          description='This switch will decide whether '
+                                                      'generate the result(s) along a '
+                                                      'linear or a circular path')
+        transize = bpy.props.FloatProperty(name="Scale of Transition",
+                                           default=1,
+                                           min=.01, max=1,
+                                           description='Sets the scale of the '
+                                                       'transition characters')
+        circsize = bpy.props.FloatProperty(name="Scale of Circle",
+                                           default=1,
+                                           min=.01, max=1,
+                                           description='Sets the scale of the '
+                                                       'circle character')
+        subdsurf = bpy.props.IntProperty(name="Subdivision Level",
+                                         default=3,
+                                         min=0, max=6,
+                                         description='Set the view level of the '
+                                                     'Subdivision Surface modifier. '
+                                                     'If set to 0 the subdivision '
+                                                     'modifer will not be added')
+        lazysubd = bpy.props.BoolProperty(name='Preview Subdivision',
+                                          default=False,
+                                          description='Displays the control cage '
+                                                      'of the results only, and '
+                                                      'subdivides them when they '
+                                                      'are rendered or exported, '
+                                                      'so changing the options '
+                                                      'does not subdivide them')
+        update_g = bpy.props.BoolProperty(name='Generator: Update',
+                                          default=False,
+                                          description='Regenerates the test results '
+                                                      'with the new values provided. '
+                                                      'It will only take effect if'
+                                                      'the Text field is empty.')
+        vars_col = bpy.props.IntProperty(name="Generator: Maximum Columns",
+                                         default=15,
+                                         min=0, max=26,
+                                         description='Sets the maximum number of '
+                                                     'variants horizontally (columns)')
+        gap_unit = bpy.props.FloatProperty(name="Generator: Space Unit",
+                                           default=3,
+                                           min=.1, max=20,
+                                           description='Sets the dimension of the '
+                                                       'gab between the variants')
+        min_char = bpy.props.IntProperty(name="Generator: Minimum Characters",
+                                         default=4,
+                                         min=3, max=360,
+                                         description='Sets the minimum number of '
+                                                     'characters in a full circle')
+        profiler = bpy.props.StringProperty(name='Profiler: Report Folder',
+                                            default=environ.get('TRANSITION_PROFILE',
+                                                                ''),
+                                            subtype='DIR_PATH',
+                                            description='If provided, the time '
+                                                        'spent in the stages of '
+                                                        'the execution and other '
+                                                        'counters will be written '
+                                                        'into this folder as JSON')
+        cprofile = bpy.props.BoolProperty(name='Profiler: cProfile',
+                                          default=bool(environ.get('TRANSITION_CPROFILE')),
+                                          description='Writes the cProfile '
+                                                      'statistics next to the '
+                                                      'report as well')
+        char_set = bpy.props.StringProperty(name='Generator: First Characters',
+                                            default='',
+                                            description='If provided, only those '
+                                                        'test transitions will be '
+                                                        'built, which start with '
+                                                        'these characters')
+        assembly = bpy.props.EnumProperty(name='Mesh Assembly',
+                                          items=(('DIRECT', 'Direct',
+                                                  'Compute the placement and build '
+                                                  'the bridged mesh in one pass'),
+                                                 ('OPERATOR', 'Operator',
+                                                  'Rotate, join and bridge the '
+                                                  'objects with the operators')),
+                                          default='DIRECT',
+                                          description='Sets how the generated '
+                                                      'objects are placed, joined '
+                                                      'and bridged into one mesh')
+        bbox_min = bpy.props.IntProperty(name='Display: Bounds From',
+                                         default=500,
+                                         min=0, max=100000,
+                                         description='If at least this many '
+                                                     'test transitions or words '
+                                                     'are built, only their '
+                                                     'bounding boxes are '
+                                                     'displayed in the viewport. '
+                                                     'If set to 0, they are '
+                                                     'always displayed fully')
+        wordlist = bpy.props.EnumProperty(name='Text: Word Layout',
+                                          items=(('NONE', 'None',
+                                                  'Build the whole text as a '
+                                                  'single word'),
+                                                 ('GRID', 'Grid',
+                                                  'Build every word into the '
+                                                  'cells of a grid'),
+                                                 ('LINES', 'Lines',
+                                                  'Build the words one after the '
+                                                  'other along lines')),
+                                          default='NONE',
+                                          description='Sets how the white space '
+                                                      'separated words of the text '
+                                                      'are laid out. The Space Unit '
+                                                      'is the gap between them, and '
+                                                      'the Maximum Columns is the '
+                                                      'number of words in a row. '
+                                                      'The words are always '
+                                                      'assembled directly')
+
+
+    class TransitionCharToChar(TransitionProperties, bpy.types.Operator):
+        """
+        Character to character transition generator and tester blender
+        operator.
+        """
+        # Basic info
+        bl_idname  = "mesh.transition_char_to_char"
+        bl_label   = "Transition Char to Char"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+        def execute(self, context):
+            """
+            Blender executes operator, and if profiling is turned on, writes the
+            report of the stages and counters (and the cProfile statistics) of
+            the execution into the profiler folder.
+            """
+            from .blender import BlenderBackend
+            from .profiling import begin_profile, end_profile, resume_profile
+            # If profiling is turned off
+            if not self.profiler:
+                return BlenderBackend(self).execute(context)
+            # Profile execution, and write report
+            state = begin_profile(self.cprofile)
+            try:
+                with resume_profile(state):
+                    return BlenderBackend(self).execute(context)
+            finally:
+                end_profile(state, self.profiler, basetext=self.basetext,
+                                                  assembly=self.assembly)
+
+
+    class TransitionCharToCharModal(TransitionProperties, bpy.types.Operator):
+        """
+        Character to character transition generator, which builds in time
+        sliced steps while the user interface stays responsive. Press Esc to
+        cancel and remove everything built so far. If profiling is turned on,
+        only the time sliced steps are profiled, and the report is written
+        when building stops.
+        """
+        # Basic info
+        bl_idname  = "mesh.transition_char_to_char_modal"
+        bl_label   = "Transition Char to Char (Interactive)"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        # Operator GUI properties
+        frame_ms = bpy.props.FloatProperty(name='Modal: Frame Budget',
+                                           default=50,
+                                           min=1, max=1000,
+                                           description='Sets the maximum time '
+                                                       'in milliseconds spent on '
+                                                       'building between two '
+                                                       'redraws. Higher values '
+                                                       'build faster, lower ones '
+                                                       'keep the interface more '
+                                                       'responsive')
+
+        #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+        def execute(self, context):
+            """
+            Blender executes operator (without the user interface, or when it is
+            redone), and builds everything at once.
+            """
+            return TransitionCharToChar.execute(self, context)
+
+        #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+        def invoke(self, context, event):
+            """
+            Starts building, and the timer which continues it in every tick.
+            """
+            from .blender import BlenderBackend
+            from .profiling import begin_profile
+            # Remember the data blocks, so a cancelled build can be rolled back
+            self._scene   = context.scene
+            self._scenes  = set(bpy.data.scenes)
+            self._objects = set(bpy.data.objects)
+            self._meshes  = set(bpy.data.meshes)
+            self._groups  = set(bpy.data.groups)
+            self._steps   = BlenderBackend(self).generate(context)
+            self._profile = (begin_profile(self.cprofile) if self.profiler else
+                             None)
+            # Start timer and progress bar
+            manager = context.window_manager
+            self._timer = manager.event_timer_add(0.01, context.window)
+            manager.progress_begin(0, 100)
+            manager.modal_handler_add(self)
+            return {'RUNNING_MODAL'}
+
+        #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+        def modal(self, context, event):
+            """
+            Builds the next steps until the frame budget is spent, and updates
+            the progress, or cancels building if Esc is pressed.
+            """
+            if event.type == 'ESC':
+                self.cancel(context)
+                return {'CANCELLED'}
+            # Let the user interface handle everything else
+            if event.type != 'TIMER':
+                return {'PASS_THROUGH'}
+            from .profiling import resume_profile
+            start = perf_counter()
+            try:
+                with resume_profile(self._profile):
+                    while True:
+                        done, total = next(self._steps)
+                        if perf_counter() - start >= self.frame_ms/1000:
+                            break
+            except StopIteration as result:
+                self._stop(context)
+                return result.value
+            # If building failed, remove everything built so far
+            except Exception as error:
+                self.cancel(context)
+                self.report({'ERROR'}, 'Transition failed: {}'.format(error))
+                return {'CANCELLED'}
+            # Show progress
+            context.window_manager.progress_update(100*done//total)
+            if context.area:
+                context.area.header_text_set('Transition: {} / {} '
+                                             '(Esc to cancel)'.format(done,
+                                                                      total))
+            return {'RUNNING_MODAL'}
+
+        #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+        def cancel(self, context):
+            """
+            Stops building, and removes the scenes, objects, meshes and groups
+            created since it was started.
+            """
+            from .blender import remove_scene
+            self._steps.close()
+            self._stop(context)
+            # A failed step may have left the active object in edit mode
+            if context.active_object and context.active_object.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
+            # The removed scenes cannot be the current one
+            if context.screen:
+                context.screen.scene = self._scene
+            for scene in set(bpy.data.scenes) - self._scenes:
+                remove_scene(scene)
+            # Objects can only be removed if no scene or group uses them
+            for obj in set(bpy.data.objects) - self._objects:
+                for scene in obj.users_scene:
+                    scene.objects.unlink(obj)
+                for group in obj.users_group:
+                    group.objects.unlink(obj)
+                bpy.data.objects.remove(obj)
+            for mesh in set(bpy.data.meshes) - self._meshes:
+                if not mesh.users:
+                    bpy.data.meshes.remove(mesh)
+            for group in set(bpy.data.groups) - self._groups:
+                bpy.data.groups.remove(group)
+            self.report({'INFO'}, 'Transition cancelled')
+
+        #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+        def _stop(self, context):
+            """
+            Removes the timer, the progress bar and the header text, and writes
+            the report if profiling is turned on.
+            """
+            manager = context.window_manager
+            manager.event_timer_remove(self._timer)
+            manager.progress_end()
+            if context.area:
+                context.area.header_text_set()
+            if self._profile:
+                from .profiling import end_profile
+                end_profile(self._profile, self.profiler,
+                            basetext=self.basetext, assembly=self.assembly)
+                self._profile = None
+
+
+#------------------------------------------------------------------------------#
+# Digests of the templates are only cached once the generation machinery is
+# loaded, so until then the handlers have nothing to drop
+def templates_reset(*args):
+    """
+    Drops the digest of the template objects (blender handler).
+    """
+    blender = modules.get(__name__ + '.blender')
+    if blender is not None:
+        blender.templates_reset()
+
+
+def templates_updated(scene):
+    """
+    Drops the digest of the template objects, if any of them was updated
+    (blender handler, called after every scene update).
+    """
+    blender = modules.get(__name__ + '.blender')
+    if blender is not None:
+        blender.templates_updated(scene)
+
+
+def template_handlers():
+    """
+    Returns the handlers of the digest of the template objects with the
+    handler lists of blender they are added to.
+    """
+    handlers = bpy.app.handlers
+    return ((handlers.scene_update_post, templates_updated),
+            (handlers.undo_post, templates_reset),
+            (handlers.redo_post, templates_reset),
+            (handlers.load_post, templates_reset))
+
+
+#------------------------------------------------------------------------------#
+# Place operator in menu
+def menu_func(self, context):
+    self.layout.operator(TransitionCharToChar.bl_idname, icon='TEXT')
+    self.layout.operator(TransitionCharToCharModal.bl_idname, icon='TEXT')
+
+# Administration functions for blender: load and unload add-on
+def register():
+    bpy.utils.register_class(TransitionCharToChar)
+    bpy.utils.register_class(TransitionCharToCharModal)
+    bpy.types.INFO_MT_mesh_add.append(menu_func)
+    # Handlers have to persist when another blend file is loaded
+    for handlers, function in template_handlers():
+        handlers.append(bpy.app.handlers.persistent(function))
+
+def unregister():
+    for handlers, function in template_handlers():
+        handlers.remove(function)
+    templates_reset()
+    bpy.types.INFO_MT_mesh_add.remove(menu_func)
+    bpy.utils.unregister_class(TransitionCharToChar)
+    bpy.utils.unregister_class(TransitionCharToCharModal)
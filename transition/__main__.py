@@ -0,0 +1,59 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Command line interface of the add-on, run it with the reference backend:
+#   python3 -m transition --words words.txt --out results
+# or with the blender backend:
+#   blender -b ABC.blend --python transition/__main__.py -- --out results
+
+# Import Python modules
+from sys import argv, exit, path
+from os.path import dirname, abspath
+
+# Import Blender modules
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# Import transition modules (blender runs this file as a script, so the folder
+# of the package has to be importable first)
+path.insert(0, dirname(dirname(abspath(__file__))))
+from transition import register
+from transition.cli import main
+
+
+#------------------------------------------------------------------------------#
+if __name__ == '__main__':
+    # If this is not blender, run from command line with the reference backend
+    if bpy is None:
+        exit(main(argv[1:]))
+    # If arguments are passed to the script, run from command line
+    if '--' in argv:
+        exit(main(argv[argv.index('--') + 1:]))
+    # If loading this add-on, register operator
+    register()
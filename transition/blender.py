@@ -0,0 +1,1196 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from math import pi
+from array import array
+from time import perf_counter
+from os import environ
+from string import ascii_lowercase
+from itertools import chain, combinations
+from collections import OrderedDict
+
+# Import Blender modules
+import bpy
+from mathutils import Matrix, Vector
+
+# Import transition modules
+from .chains import (CIRCLE, GRID_ARCS, align_chain, chain_size, grid_steps,
+                     plan_text, profile_shapes, variant_key)
+from .meshes import (bridge_faces, bridge_order, edge_loop, offset_faces,
+                     place_chain)
+from .profiling import count, finish, profiled, stage
+from .tables import kerning_path, load_kerning, toascii
+
+
+#------------------------------------------------------------------------------#
+@profiled
+def assemble_mesh(name, segments, closed, matrix):
+    """
+    Creates a new mesh from the edge loops of the given objects and bridges
+    each loop to the next one (and the last one to the first if closed).
+    The vertices are placed relative to the given matrix.
+    """
+    # Transform loops into the space of the result and align them
+    # to their predecessors
+    inverse = matrix.inverted()
+    loops = []
+    for obj in segments:
+        local  = inverse*obj.matrix_basis
+        coords = obj.data.vertices
+        loop = [tuple(local*coords[i].co) for i in edge_loop(obj.data)]
+        if loops:
+            loop = [loop[i] for i in bridge_order(loops[-1], loop)]
+        loops.append(loop)
+    # Return new mesh
+    return bridge_mesh(name, array('f', chain(*chain(*loops))), len(loops[0]),
+                       closed)
+
+
+#------------------------------------------------------------------------------#
+@profiled
+def bridge_mesh(name, coords, size, closed):
+    """
+    Creates a new mesh from the flat buffer of the aligned vertex coordinates
+    of the loops (size vertices each), and bridges each loop to the next one
+    (and the last one to the first if closed).
+    """
+    verts = len(coords)//3
+    faces = bridge_faces(coords, size, closed)
+    # Create mesh and fill its buffers directly
+    polys = len(faces)//4
+    count('vertices produced', verts)
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(verts)
+    mesh.vertices.foreach_set('co', coords)
+    mesh.loops.add(len(faces))
+    mesh.loops.foreach_set('vertex_index', faces)
+    mesh.polygons.add(polys)
+    mesh.polygons.foreach_set('loop_start', array('i', range(0, len(faces), 4)))
+    mesh.polygons.foreach_set('loop_total', array('i', [4])*polys)
+    # Set smooth shading on all faces
+    mesh.polygons.foreach_set('use_smooth', array('i', [1])*polys)
+    # Create edges from the faces
+    mesh.update(calc_edges=True)
+    # Return new mesh
+    return mesh
+
+
+#------------------------------------------------------------------------------#
+def link_result(scene, name, mesh, matrix, subdsurf, preview=False):
+    """
+    Creates a new object of the mesh with the given matrix and subdivision
+    level, links it to the scene and makes it the active object. If preview,
+    the mesh is only subdivided when it is rendered or exported.
+    """
+    # Create result object and link it to the scene as active object
+    result = bpy.data.objects.new(name, mesh)
+    result.matrix_basis = matrix
+    scene.objects.link(result)
+    scene.objects.active = result
+    # Add subdivision modifier and set its level and display mode
+    if subdsurf:
+        modifier = result.modifiers.new('Subsurf', 'SUBSURF')
+        modifier.levels = 0 if preview else subdsurf
+        modifier.render_levels = subdsurf
+        modifier.show_only_control_edges = True
+    # Return new object
+    return result
+
+
+#------------------------------------------------------------------------------#
+def remove_scene(scene):
+    """
+    Removes the scene with all its objects, and their meshes which are not
+    used by anything else. The objects are unlinked from their groups as
+    well, as the groups would keep them.
+    """
+    # Instances share their meshes
+    meshes = {obj.data for obj in scene.objects if obj.type == 'MESH'}
+    for obj in tuple(scene.objects):
+        scene.objects.unlink(obj)
+        for group in obj.users_group:
+            group.objects.unlink(obj)
+        if not obj.users:
+            bpy.data.objects.remove(obj)
+    bpy.data.scenes.remove(scene)
+    # Template meshes are still used by the template objects
+    for mesh in meshes:
+        if not mesh.users:
+            bpy.data.meshes.remove(mesh)
+
+
+#------------------------------------------------------------------------------#
+def glyph_profile(obj, scale):
+    """
+    Returns the coordinates of the edge loop of the object in walk order,
+    scaled by scale and rotated like the object.
+    """
+    rotation = obj.matrix_basis.decompose()[1]
+    sx, sy, sz = scale
+    # Read all coordinates at once
+    coords = array('f', [0])*(3*len(obj.data.vertices))
+    obj.data.vertices.foreach_get('co', coords)
+    return tuple(tuple(rotation*Vector((coords[3*i]*sx,
+                                        coords[3*i + 1]*sy,
+                                        coords[3*i + 2]*sz)))
+                 for i in edge_loop(obj.data))
+
+
+#------------------------------------------------------------------------------#
+@profiled
+def glyph_profiles(objects, transize, circsize):
+    """
+    Returns the profiles of all templates keyed by their symbols in the
+    kerning table: 'A' for a_start, 'a' for a_trans and 0 for _circle.
+    """
+    profiles = {}
+    for char in ascii_lowercase:
+        start, trans = objects[char]
+        profiles[char.upper()] = glyph_profile(start, start.scale)
+        profiles[char] = glyph_profile(trans, (transize,)*3)
+    profiles[0] = glyph_profile(objects[0][0], (circsize,)*3)
+    return profiles
+
+
+#------------------------------------------------------------------------------#
+# Digest of the template objects of the session, dropped when any of them is
+# updated, an undo step is undone or redone, or another blend file is loaded
+_hashes = {}
+
+@profiled
+def template_hash(objects):
+    """
+    Returns a digest of the names, transformations and edge loops of all
+    the template objects, which are only read if they changed since the
+    digest was computed.
+    """
+    from hashlib import sha1
+    try:
+        return _hashes['templates']
+    except KeyError:
+        pass
+    count('templates hashed')
+    digest = sha1()
+    for key in sorted(objects, key=str):
+        for obj in objects[key]:
+            mesh = obj.data
+            coords = array('f', [0])*(3*len(mesh.vertices))
+            edges  = array('i', [0])*(2*len(mesh.edges))
+            mesh.vertices.foreach_get('co', coords)
+            mesh.edges.foreach_get('vertices', edges)
+            digest.update(obj.name.encode('utf-8'))
+            digest.update(array('f', chain(*obj.matrix_basis)).tobytes())
+            digest.update(coords.tobytes())
+            digest.update(edges.tobytes())
+    _hashes['templates'] = digest.hexdigest()
+    return _hashes['templates']
+
+
+def templates_reset(*args):
+    """
+    Drops the digest of the template objects (blender handler).
+    """
+    _hashes.clear()
+
+
+def templates_updated(scene):
+    """
+    Drops the digest of the template objects, if any of them or of their
+    meshes was updated (blender handler, called after every scene update).
+    """
+    if not _hashes or not (bpy.data.objects.is_updated or
+                           bpy.data.meshes.is_updated):
+        return
+    try:
+        objects = template_objects()
+    except KeyError:
+        _hashes.clear()
+        return
+    for obj in chain(*objects.values()):
+        if obj.is_updated or obj.is_updated_data or obj.data.is_updated:
+            _hashes.clear()
+            return
+
+
+#------------------------------------------------------------------------------#
+@profiled
+def arc_matrices(objects, location, pivot, angle, axis):
+    """
+    Returns the matrices of the objects moved to location, then rotated around
+    the pivot point: the nth object by n times the nth part of the angle.
+    """
+    rotation = angle/len(objects)
+    # Move to pivot point, rotate and move back
+    pivot  = Matrix.Translation(pivot)
+    origin = pivot.inverted()*Matrix.Translation(location)
+    matrices = []
+    for i, obj in enumerate(objects):
+        # Keep rotation and scale of the object only
+        basis = obj.matrix_basis.copy()
+        basis.translation = 0, 0, 0
+        matrices.append(pivot*Matrix.Rotation(i*rotation, 4, axis)*origin*basis)
+    # Return new matrices
+    return matrices
+
+
+#------------------------------------------------------------------------------#
+def template_objects():
+    """
+    Returns the start and the transition templates of the characters, and the
+    circle template (twice) keyed by 0.
+    """
+    bdobjs = bpy.data.objects
+    objects = {c:(bdobjs['{}_start'.format(c)],
+                  bdobjs['{}_trans'.format(c)]) for c in ascii_lowercase}
+    objects[0] = (bdobjs['_circle'],)*2
+    return objects
+
+
+#------------------------------------------------------------------------------#
+# Evaluated meshes in object space, keyed by the digest of their base meshes
+# and their subdivision levels, the least recently used ones are dropped first
+# (and all of them after every result written by --stream). Only the exports
+# use them: the viewport (and so the redo panel) evaluates the modifiers in
+# blender itself, there the preview mode avoids subdividing the results
+_evaluated = OrderedDict()
+EVALUATED_SIZE = int(environ.get('TRANSITION_EVALUATED_SIZE', 256*1024*1024))
+
+
+def evaluated_key(obj):
+    """
+    Returns the key of the evaluated mesh of the object, or None if it has
+    modifiers other than subdivision surfaces.
+    """
+    from hashlib import sha1
+    level = 0
+    for modifier in obj.modifiers:
+        if modifier.type != 'SUBSURF':
+            return None
+        if modifier.show_render:
+            level += modifier.render_levels
+    # Digest of the vertices and faces of the base mesh
+    mesh   = obj.data
+    coords = array('f', [0])*(3*len(mesh.vertices))
+    loops  = array('i', [0])*len(mesh.loops)
+    totals = array('i', [0])*len(mesh.polygons)
+    mesh.vertices.foreach_get('co', coords)
+    mesh.loops.foreach_get('vertex_index', loops)
+    mesh.polygons.foreach_get('loop_total', totals)
+    digest = sha1(coords.tobytes())
+    digest.update(loops.tobytes())
+    digest.update(totals.tobytes())
+    return digest.hexdigest(), level
+
+
+def mesh_faces(mesh):
+    """
+    Returns the flat vertex coordinates and the faces of the mesh.
+    """
+    coords = array('f', [0])*(3*len(mesh.vertices))
+    loops  = array('i', [0])*len(mesh.loops)
+    totals = array('i', [0])*len(mesh.polygons)
+    mesh.vertices.foreach_get('co', coords)
+    mesh.loops.foreach_get('vertex_index', loops)
+    mesh.polygons.foreach_get('loop_total', totals)
+    # Split loops into faces
+    faces = []
+    start = 0
+    for total in totals:
+        faces.append(tuple(loops[start:start + total]))
+        start += total
+    return coords, faces
+
+
+@profiled
+def evaluated_mesh(scene, obj):
+    """
+    Returns the vertex coordinates and the faces of the object in object space
+    with all its modifiers applied at their render (export) levels.
+    """
+    key = evaluated_key(obj)
+    try:
+        coords, faces = _evaluated.pop(key)
+        count('evaluated meshes reused')
+    except KeyError:
+        # Get evaluated copy of the mesh
+        mesh = obj.to_mesh(scene, True, 'RENDER')
+        coords, faces = mesh_faces(mesh)
+        bpy.data.meshes.remove(mesh)
+        count('evaluated meshes computed')
+        if key is None:
+            return coords, faces
+    # Mark mesh as recently used, and drop the least recently used ones
+    _evaluated[key] = coords, faces
+    size = sum(4*len(c) + 16*len(f) for c, f in _evaluated.values())
+    while size > EVALUATED_SIZE and len(_evaluated) > 1:
+        _, (c, f) = _evaluated.popitem(last=False)
+        size -= 4*len(c) + 16*len(f)
+    return coords, faces
+
+
+#------------------------------------------------------------------------------#
+@profiled
+def mesh_data(scene, objects, cage=False):
+    """
+    Returns the flat vertex coordinates and the faces of the objects in world
+    space with all their modifiers applied, or if cage, without them.
+    """
+    verts = array('f')
+    faces = []
+    for obj in objects:
+        # Get evaluated (or base) mesh and place it in world space
+        coords, polygons = (mesh_faces(obj.data) if cage else
+                            evaluated_mesh(scene, obj))
+        matrix = obj.matrix_world
+        offset = len(verts)//3
+        for co in zip(*[iter(coords)]*3):
+            verts.extend(matrix*Vector(co))
+        # Mirrored instances would face inwards without reversing their faces
+        faces.extend(offset_faces(polygons, offset, matrix.determinant() < 0))
+    # Return raw data
+    return verts, faces
+
+
+#------------------------------------------------------------------------------#
+def set_new_obj_properties(loop_type):
+    """
+    Function decorator for:
+        - joining generated objects by the decorated function
+        - bridgeing the edges loops in the joined mesh object
+        - setting other properties, such as shading or origin point
+    The decorated function has to return its objects in the order of bridging.
+    """
+    # Create wrapper (decorator with arg)
+    def main_wrapper(function):
+        # Create new function (actual wrapper)
+        def sub_wrapper(self, *args, **kwargs):
+            # Call original function
+            segments = function(self, *args, **kwargs)
+            # If the mesh has to be assembled by the mesh operators
+            if self.assembly == 'OPERATOR':
+                # Join all selected objects into the selected active object
+                with stage('join'):
+                    bpy.ops.object.join()
+                # Switch to edit mode and select all geometry
+                with stage('bridge_edge_loops'):
+                    bpy.ops.object.mode_set(mode='EDIT')
+                    bpy.ops.mesh.select_all(action='SELECT')
+                    # Add edge loops
+                    bpy.ops.mesh.bridge_edge_loops(type=loop_type)
+                # Add subdivision modifier and set its level and display mode
+                with stage('subdivision_set'):
+                    bpy.ops.object.subdivision_set(level=self.subdsurf)
+                    modifier = bpy.context.object.modifiers['Subsurf']
+                    modifier.show_only_control_edges = True
+                    # Export and render at the set level, and if previewed,
+                    # display the control cage only
+                    modifier.render_levels = self.subdsurf
+                    if self.lazysubd:
+                        modifier.levels = 0
+                # Switch back to object mode
+                with stage('shade_smooth'):
+                    bpy.ops.object.mode_set(mode='OBJECT')
+                    # If transition was circular, then move origin point to 3D Cursor
+                    if self.circular:
+                        bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
+                        count('operators invoked')
+                    # Set shaded mode to 'Smooth'
+                    bpy.ops.object.shade_smooth()
+                count('operators invoked', 7)
+                count('vertices produced', len(bpy.context.object.data.vertices))
+                # Deselect all objects
+                bpy.context.scene.objects.active.select = False
+                return
+            # Result takes the transformation of the active object, and
+            # if transition was circular, its origin point is the 3D Cursor
+            scene  = segments[0].users_scene[0]
+            name   = scene.objects.active.name
+            matrix = scene.objects.active.matrix_basis.copy()
+            if self.circular:
+                matrix.translation = scene.cursor_location
+            # Build joined and bridged mesh directly from the edge loops
+            mesh = assemble_mesh(name, segments, loop_type == 'CLOSED', matrix)
+            # Remove the placed objects (their meshes are the templates')
+            for obj in segments:
+                scene.objects.unlink(obj)
+                bpy.data.objects.remove(obj)
+            # Create result object
+            link_result(scene, name, mesh, matrix, self.subdsurf, self.lazysubd)
+        # Return new function
+        return sub_wrapper
+    # Return wrapper
+    return main_wrapper
+
+
+#------------------------------------------------------------------------------#
+class BlenderBackend:
+    """
+    Generates the transitions into the scenes of blender with the properties
+    of the operator, by duplicating and joining the template objects or by
+    building the meshes directly.
+    """
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def __init__(self, operator):
+        self.operator = operator
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def __getattr__(self, name):
+        # Properties and reports are the operator's
+        return getattr(self.operator, name)
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def _newscene(self, context, name):
+        """
+        Creates a new scene, and makes it the current one if there is a screen.
+        """
+        # If blender is running in background there is no screen to switch
+        if context.screen is None:
+            return bpy.data.scenes.new(name)
+        # Create new scene and switch to it
+        bpy.ops.scene.new()
+        scene = context.scene
+        scene.name = name
+        # Return new scene
+        return scene
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def _bounds(self, obj):
+        """
+        Displays only the bounding box of the result in the viewport, and does
+        not subdivide it there (it is still subdivided when rendered).
+        """
+        obj.draw_type = 'BOUNDS'
+        for modifier in obj.modifiers:
+            if modifier.type == 'SUBSURF':
+                modifier.show_viewport = False
+        count('results bounded')
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def _gridmatrix(self, x, z, length, transform):
+        """
+        Returns the matrix, which places the test transition of length
+        segments from the grid origin to x and z, transformed as variant_key
+        returns it.
+        """
+        d = self.distance
+        reverse, mirror_x, mirror_z = transform
+        mirror = Matrix.Scale(mirror_x, 4, (1, 0, 0))*Matrix.Scale(mirror_z, 4,
+                                                                   (0, 0, 1))
+        # Circles are rotated around the 3D Cursor from the -X axis, and
+        # reversed by mirroring them along the bisector of their arc
+        if self.circular:
+            frame = Matrix.Translation((x + d, 0, z))
+            if reverse:
+                angle = pi/(self.min_char/2)*GRID_ARCS[length]
+                angle = pi + angle*(length - 1)/length/2
+                mirror = (Matrix.Rotation(angle, 4, 'Z')*
+                          Matrix.Scale(-1, 4, (0, 1, 0))*
+                          Matrix.Rotation(-angle, 4, 'Z')*mirror)
+        # Lines are reversed by mirroring them along their middle
+        else:
+            frame = Matrix.Translation((x, 0, z))
+            if reverse:
+                mirror = (Matrix.Translation((0, (length - 1)*d, 0))*
+                          Matrix.Scale(-1, 4, (0, 1, 0))*mirror)
+        return frame*mirror
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    @profiled
+    def _dupobj(self, scene, name, copyobj):
+        """
+        Duplicates given object to a scene, and selects it.
+        """
+        count('objects duplicated')
+        # If mesh is assembled directly, share the data block of the old
+        # object, otherwise the joined objects need their own copies
+        if self.assembly == 'DIRECT':
+            ob_new = bpy.data.objects.new(name, copyobj.data)
+        else:
+            ob_new = bpy.data.objects.new(name, copyobj.data.copy())
+        ob_new.scale = copyobj.scale
+        ob_new.location = copyobj.location
+        # Link new object to the given scene and select it
+        scene.objects.link(ob_new)
+        ob_new.select = True
+        # Return new object
+        return ob_new
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    @profiled
+    def _rotobj(self, scene, objects, location, radius, angle, axis):
+        """
+        Rotates all objects around the axis with the given angle.
+        """
+        x, y, z = location
+        rotation = angle/len(objects)
+        # Place 3D Cursor (origin of the circular results)
+        scene.cursor_location = x + radius, y, z
+        # If objects are placed directly
+        if self.assembly == 'DIRECT':
+            matrices = arc_matrices(objects, location, scene.cursor_location,
+                                    angle, axis)
+            for obj, matrix in zip(objects, matrices):
+                obj.matrix_basis = matrix
+            return
+        # Set Pivot point to 3D Cursor
+        bpy.context.space_data.pivot_point = 'CURSOR'
+        # Deselect all objects
+        for obj in objects:
+            obj.location = location
+            obj.select = False
+        # Rotate objects
+        for i, obj in enumerate(objects):
+            obj.select = True
+            bpy.ops.transform.rotate(value=i*rotation, axis=axis)
+            count('operators invoked')
+            obj.select = False
+        # Select all objects
+        for obj in objects:
+            obj.select = True
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    @set_new_obj_properties('SINGLE')
+    def _ctotc(self, char1, char2, obj1, obj2, objects, x, z, scene, circular):
+        """
+        Character to Transition to Circle to Transition to Character.
+        """
+        # Set local reference
+        d = self.distance
+        dup = self._dupobj
+        # Get original objects
+        trans1 = objects[char1][1]
+        trans2 = objects[char2][1]
+        # Duplicate objects
+        nobj1  = dup(scene, obj1.name + '_', obj1)
+        nobj2  = dup(scene, trans1.name + '_', trans1)
+        circle = dup(scene, '{}->{}->(0)->{}->{}'.format(char1.upper(),
+                                                         char1,
+                                                         char2,
+                                                         char2.upper()), objects[0][0])
+        nobj3  = dup(scene, trans2.name + '_', trans2)
+        nobj4  = dup(scene, obj2.name + '_', obj2)
+        # Scale objects
+        nobj2.scale  = nobj3.scale = (self.transize,)*3
+        circle.scale = (self.circsize,)*3
+        # If circular array
+        if circular:
+            # Rotate objects
+            self._rotobj(scene    = scene,
+                         objects  = (nobj1, nobj2, circle, nobj3, nobj4),
+                         location = (x, 0, z),
+                         radius   = d,
+                         angle    = pi/(self.min_char/2)*1.25,
+                         axis     = (0, 0, 1))
+        # If linear array
+        else:
+            nobj1.location  = x, 0, z
+            nobj2.location  = x, d, z
+            circle.location = x, d*2, z
+            nobj3.location  = x, d*3, z
+            nobj4.location  = x, d*4, z
+        # Set circle as the active object
+        scene.objects.active = circle
+        # Return objects in order
+        return nobj1, nobj2, circle, nobj3, nobj4
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Interface for _ctoc()
+    def _ct1oc(self, char1, char2, obj1, obj2, objects, x, z, scene, circular):
+        self._ctoc(char1, char2, obj1, obj2, objects, x, z, scene, circular, False)
+
+    # Interface for _ctoc()
+    def _ct2oc(self, char1, char2, obj1, obj2, objects, x, z, scene, circular):
+        self._ctoc(char1, char2, obj1, obj2, objects, x, z, scene, circular, True)
+
+    @set_new_obj_properties('SINGLE')
+    def _ctoc(self, char1, char2, obj1, obj2, objects, x, z, scene, circular, reverse):
+        """
+        Character to Transition to Circle to Character.
+        """
+        # Set local reference
+        d = self.distance
+        dup = self._dupobj
+        # Duplicate objects
+        nobj1  = dup(scene, obj1.name + '_', obj1)
+        nobj3  = dup(scene, obj2.name + '_', obj2)
+        # If Character to Circle to Transition to Character
+        if reverse:
+            # Get original objects
+            trans = objects[char2][1]
+            # Duplicate objects
+            circle = dup(scene, '{}->(0)->{}->{}'.format(char1.upper(),
+                                                         char2,
+                                                         char2.upper()), objects[0][0])
+            nobj2  = dup(scene, trans.name + '_', trans)
+            # Set up group and locations
+            group = nobj1, circle, nobj2, nobj3
+            loc = (x, d*2, z), (x, d, z)
+        # If Character to Transition to Circle to Character
+        else:
+            # Get original objects
+            trans = objects[char1][1]
+            # Duplicate objects
+            nobj2  = dup(scene, trans.name + '_', trans)
+            circle = dup(scene, '{}->{}->(0)->{}'.format(char1.upper(),
+                                                         char1,
+                                                         char2.upper()), objects[0][0])
+            # Set up group and locations
+            group = nobj1, nobj2, circle, nobj3
+            loc = (x, d, z), (x, d*2, z)
+        # Scale objects
+        nobj2.scale  = (self.transize,)*3
+        circle.scale = (self.circsize,)*3
+        # If circular array
+        if circular:
+            # Rotate objects
+            self._rotobj(scene    = scene,
+                         objects  = group,
+                         location = (x, 0, z),
+                         radius   = d,
+                         angle    = pi/(self.min_char/2)*1.3333333333,
+                         axis     = (0, 0, 1))
+        # If linear array
+        else:
+            nobj1.location  = x, 0, z
+            nobj2.location  = loc[0]
+            circle.location = loc[1]
+            nobj3.location  = x, d*3, z
+        # Set circle as the active object
+        scene.objects.active = circle
+        # Return objects in order
+        return group
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Interface for _ctc()
+    def _ct1c(self, char1, char2, obj1, obj2, objects, x, z, scene, circular):
+        self._ctc(char1, char2, obj1, obj2, objects, x, z, scene, circular, False)
+
+    # Interface for _ctc()
+    def _ct2c(self, char1, char2, obj1, obj2, objects, x, z, scene, circular):
+        self._ctc(char1, char2, obj1, obj2, objects, x, z, scene, circular, True)
+
+    @set_new_obj_properties('SINGLE')
+    def _ctc(self, char1, char2, obj1, obj2, objects, x, z, scene, circular, reverse):
+        """
+        Character to Transition to Character.
+        """
+        # Set local reference
+        d = self.distance
+        dup = self._dupobj
+        # Get original objects
+        tchar = char2 if reverse else char1
+        # Duplicate objects
+        nobj1  = dup(scene, obj1.name + '_', obj1)
+        nobj2  = dup(scene, '{}->{}->{}'.format(char1.upper(),
+                                                tchar,
+                                                char2.upper()), objects[tchar][1])
+        nobj3  = dup(scene, obj2.name + '_', obj2)
+        # Scale objects
+        nobj2.scale  = (self.transize,)*3
+        # If circular array
+        if circular:
+            # Rotate objects
+            self._rotobj(scene    = scene,
+                         objects  = (nobj1, nobj2, nobj3),
+                         location = (x, 0, z),
+                         radius   = d,
+                         angle    = pi/(self.min_char/2)*1.5,
+                         axis     = (0, 0, 1))
+        # If linear array
+        else:
+            nobj1.location  = x, 0, z
+            nobj2.location  = x, d, z
+            nobj3.location  = x, d*2, z
+        # Set circle as the active object
+        scene.objects.active = nobj2
+        # Return objects in order
+        return nobj1, nobj2, nobj3
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    @set_new_obj_properties('SINGLE')
+    def _coc(self, char1, char2, obj1, obj2, objects, x, z, scene, circular):
+        """
+        Character to Circle to Character
+        """
+        # Set local reference
+        d = self.distance
+        dup = self._dupobj
+        # Duplicate objects
+        nobj1  = dup(scene, obj1.name + '_', obj1)
+        circle = dup(scene, '{}->(0)->{}'.format(char1.upper(),
+                                                 char2.upper()), objects[0][0])
+        nobj2  = dup(scene, obj2.name + '_', obj2)
+        # Scale objects
+        circle.scale = (self.circsize,)*3
+        # If circular array
+        if circular:
+            # Rotate objects
+            self._rotobj(scene    = scene,
+                         objects  = (nobj1, circle, nobj2),
+                         location = (x, 0, z),
+                         radius   = d,
+                         angle    = pi/(self.min_char/2)*1.5,
+                         axis     = (0, 0, 1))
+        # If linear array
+        else:
+            nobj1.location  = x, 0, z
+            circle.location = x, d, z
+            nobj2.location  = x, d*2, z
+        # Set circle as the active object
+        scene.objects.active = circle
+        # Return objects in order
+        return nobj1, circle, nobj2
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    @set_new_obj_properties('SINGLE')
+    def _cc(self, char1, char2, obj1, obj2, objects, x, z, scene, circular):
+        """
+        Character to Character.
+        """
+        # Set local reference
+        d = self.distance
+        # Duplicate objects
+        nobj1 = self._dupobj(scene, '{}->{}'.format(char1.upper(),
+                                                    char2.upper()), obj1)
+        nobj2 = self._dupobj(scene, obj2.name + '_', obj2)
+        # If circular array
+        if circular:
+            # Rotate objects
+            self._rotobj(scene    = scene,
+                         objects  = (nobj1, nobj2),
+                         location = (x, 0, z),
+                         radius   = d,
+                         angle    = pi/(self.min_char/2)*2,
+                         axis     = (0, 0, 1))
+        # If linear array
+        else:
+            # Move objects
+            nobj1.location = x, 0, z
+            nobj2.location = x, d, z
+        # Set the first object as active
+        scene.objects.active = nobj1
+        # Return objects in order
+        return nobj1, nobj2
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    @set_new_obj_properties('CLOSED')
+    def _ctrans(self, basetext, kerning, objects, scene):
+        """
+        Full circle transition based on the kerning table.
+        """
+        # Plan and create transition (placed around the origin)
+        plan = plan_text(basetext, kerning, self.distance, self.transize,
+                         self.circsize, True)
+        basetext += basetext[0]
+        group = self._trans(plan, objects, scene, basetext)
+        # Place 3D Cursor (origin of the circular results)
+        scene.cursor_location = 0, 0, 0
+        # Name the last one and set it as active object
+        group[-1].name = basetext + '_circular_transition'
+        scene.objects.active = group[-1]
+        # Return objects in order
+        return group
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    @set_new_obj_properties('SINGLE')
+    def _ltrans(self, basetext, kerning, objects, scene):
+        """
+        Full linear transition based on the kerning table.
+        """
+        # Plan and create transition
+        plan = plan_text(basetext, kerning, self.distance, self.transize,
+                         self.circsize, False)
+        group = self._trans(plan, objects, scene, basetext)
+        # Name the last one and set it as active object
+        group[-1].name = basetext + '_linear_transition'
+        scene.objects.active = group[-1]
+        # Return objects in order
+        return group
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def _itrans(self, basetext, kerning, objects, scene,
+                location=(0, 0, 0), stamp=None, profiles=None):
+        """
+        Full linear or circular transition based on the kerning table, built
+        directly from the profiles of the templates. Only the pairs changed
+        since the previous call are aligned again, and the aligned pairs are
+        cached on disk as well. The result starts from (or is centered on)
+        the location. Yields the number of aligned and all pairs after every
+        pair, and returns the length of the result along the Y axis.
+        """
+        # Set local references
+        d = self.distance
+        circular = self.circular
+        if circular:
+            basetext += basetext[0]
+        # Get aligned chain of the profiles
+        stamp = stamp or (template_hash(objects), self.transize, self.circsize)
+        loops = yield from align_chain(basetext, kerning, stamp,
+                                       profiles or
+                                       (lambda: glyph_profiles(objects,
+                                                               self.transize,
+                                                               self.circsize)),
+                                       circular)
+        # Place the profiles around a circle or along a line
+        coords, last = place_chain(loops, d, circular)
+        # Create result object
+        name = basetext + ('_circular_transition' if circular else
+                           '_linear_transition')
+        mesh = bridge_mesh(name, coords, len(loops[0][1]), circular)
+        x, y, z = location
+        link_result(scene, name, mesh, Matrix.Translation((x, y + last, z)),
+                    self.subdsurf, self.lazysubd)
+        # Return length of the result
+        return 2*d if circular else last
+
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def _btrans(self, words, kerning, objects, scene):
+        """
+        Linear or circular transitions of all the words, laid out on a grid or
+        along lines and built in one pass, then reports the throughput. Every
+        distinct word is only built once, its repeated occurrences are
+        instances of the same mesh. Different words only share the aligned
+        spans of their common character pairs, their meshes are built one by
+        one: a word is a single mesh subdivided as a whole, so instancing its
+        shared segments as separate pieces would change its surface at their
+        seams. Yields the number of built and distinct words after each
+        distinct word.
+        """
+        # Set local references
+        d       = self.distance
+        space   = self.gap_unit
+        columns = max(self.vars_col, 1)
+        # Circles are as wide as they are long
+        width = 2*d if self.circular else 0
+        # Hash the templates and get their profiles only once for all words
+        stamp = template_hash(objects), self.transize, self.circsize
+        cache = []
+        def profiles():
+            if not cache:
+                cache.append(glyph_profiles(objects, self.transize,
+                                                     self.circsize))
+            return cache[0]
+        # Lay out words, and collect the locations of the distinct ones
+        start = perf_counter()
+        locations = OrderedDict()
+        y = 0
+        for i, word in enumerate(words):
+            col, row = i%columns, i//columns
+            # Words are next to each other in the columns of a grid
+            if self.wordlist == 'GRID':
+                location = col*(width + space), 0, row*space
+            # Or follow each other along lines from top to bottom
+            else:
+                y = y if col else 0
+                location = 0, y + width/2, -row*space
+            locations.setdefault(word, []).append(location)
+            y += (width or (chain_size(word, kerning) - 1)*d) + space
+        # Build the distinct words in alphabetical order, so the consecutive
+        # ones reuse the longest possible aligned beginnings of their chains
+        building = 0
+        bounds = 0 < self.bbox_min <= len(words)
+        for i, word in enumerate(sorted(locations)):
+            first, *others = locations[word]
+            begin  = perf_counter()
+            length = finish(self._itrans(word, kerning, objects, scene,
+                                         first, stamp, profiles))
+            building += perf_counter() - begin
+            count('words built')
+            results = [scene.objects.active]
+            # Instance the mesh at the repeated occurrences of the word
+            mesh = results[0].data
+            last = 0 if self.circular else length
+            for x, y, z in others:
+                results.append(link_result(scene, mesh.name, mesh,
+                                           Matrix.Translation((x, y + last, z)),
+                                           self.subdsurf, self.lazysubd))
+                count('repeated words instanced')
+            if bounds:
+                for result in results:
+                    self._bounds(result)
+            yield i + 1, len(locations)
+        # Report throughput, and the time saved by the instances
+        seconds   = perf_counter() - start
+        instanced = len(words) - len(locations)
+        self.report({'INFO'}, '{} words in {:.3f}s ({:.1f} words/s), {} '
+                              'repeated words instanced (about {:.3f}s '
+                              'saved)'.format(
+                                  len(words), seconds, len(words)/(seconds or 1),
+                                  instanced,
+                                  instanced*building/(len(locations) or 1)))
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def _trans(self, plan, objects, scene, name):
+        """
+        Creates a full transition "chain" from the plan of its segments.
+        """
+        # Set local reference
+        group = []
+        dup = self._dupobj
+        for glyph, kind, scale, position, rotation in plan:
+            # Get template object
+            if kind == CIRCLE:
+                obj = objects[0][0]
+            else:
+                obj = objects[ascii_lowercase[glyph//2]][kind]
+            # Duplicate object, and place it
+            nobj = dup(scene, name + obj.name, obj)
+            if scale:
+                nobj.scale = (scale,)*3
+            nobj.location = position
+            nobj.rotation_euler = 0, 0, rotation
+            group.append(nobj)
+        # Return all objects in order
+        return group
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def execute(self, context):
+        """
+        Generates the transitions.
+        """
+        return finish(self.generate(context))
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def generate(self, context):
+        """
+        Generates the transitions step by step: yields the number of finished
+        and all steps after every test transition, word of a batch or pair of
+        a single text, and returns the result of the operator.
+        """
+        # If __font__ scene is available
+        try:
+            bpy.data.scenes['__font__']
+        # If __font__ scene does not exist
+        # then name the current scene to it
+        except KeyError:
+            context.scene.name = '__font__'
+        # Make sure area is in Object Mode, and deselect everything (only the
+        # selected objects of the scene, if it can be told which ones they are)
+        if context.active_object and context.active_object.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+        for obj in getattr(context, 'selected_objects', bpy.data.objects):
+            obj.select = False
+
+        # Get essentials as local references
+        basetext  = toascii(self.basetext.lower())
+        space     = self.gap_unit
+        vars_col  = self.vars_col * space
+        circular  = self.circular
+        functions = (self._cc, self._coc, self._ct1c, self._ct2c,
+                     self._ct1oc, self._ct2oc, self._ctotc)
+
+        # Get all character objects and their transitions and the circle object
+        objects = template_objects()
+
+        # If generate complex text
+        if basetext:
+            # Load compiled kerning table
+            kerning, problems = load_kerning(kerning_path())
+            # Split text into words, if they are built one by one
+            if self.wordlist == 'NONE':
+                words = [basetext]
+            else:
+                words = [toascii(word) for word in self.basetext.lower().split()]
+                words = [word for word in words if word]
+            # A single text can only contain letters, the words of a list
+            # with other characters are left out
+            letters = set(ascii_lowercase)
+            if self.wordlist == 'NONE' and not set(basetext) <= letters:
+                self.report({'ERROR'}, 'Text can only contain the letters a-z')
+                return {'CANCELLED'}
+            invalid = {word for word in words if not set(word) <= letters}
+            # A line needs at least two profiles to be bridged
+            if not circular and self.wordlist == 'NONE' and len(basetext) < 2:
+                self.report({'ERROR'}, 'Linear text needs at least two letters')
+                return {'CANCELLED'}
+            # Check all transitions of the words (each of them only once)
+            pairs = set()
+            for word in words:
+                if word in invalid:
+                    continue
+                pairs.update(zip(word, word[1:] + (word[0] if circular else '')))
+            missing = set()
+            for pair in sorted(pairs):
+                try:
+                    problem = problems[pair]
+                except KeyError:
+                    continue
+                message = '{} -> {}: {}'.format(*pair + (problem,))
+                if kerning[ord(pair[0]) - 97][ord(pair[1]) - 97] is None:
+                    # A single text cannot be built without the transition
+                    if self.wordlist == 'NONE':
+                        self.report({'ERROR'}, message)
+                        return {'CANCELLED'}
+                    missing.add(pair)
+                self.report({'WARNING'}, message)
+            # Leave out the words of the list which cannot be built (the ones
+            # with other characters than letters or with missing transitions,
+            # and single letters along a line)
+            skipped = [word for word in words
+                       if word in invalid
+                       or missing & set(zip(word, word[1:] +
+                                            (word[0] if circular else '')))
+                       or not circular and len(word) < 2]
+            if skipped:
+                words = [word for word in words if word not in skipped]
+                self.report({'WARNING'}, 'Left out {} word(s): {}'.format(
+                                             len(skipped), ' '.join(skipped)))
+                if not words:
+                    self.report({'ERROR'}, 'None of the words can be built')
+                    return {'CANCELLED'}
+            # Create new scene for result if scene does not exist
+            try:
+                bpy.data.scenes[basetext]
+            except KeyError:
+                scene = self._newscene(context, basetext)
+            # Generate transition pattern
+            if self.wordlist != 'NONE':
+                yield from self._btrans(words, kerning, objects, scene)
+            elif self.assembly == 'DIRECT':
+                yield from self._itrans(basetext, kerning, objects, scene)
+            else:
+                (self._ctrans if circular else self._ltrans)(basetext,
+                                                             kerning,
+                                                             objects,
+                                                             scene)
+                yield 1, 1
+
+        # If generate test cases
+        elif self.update_g:
+            variations = tuple(v for v in combinations(ascii_lowercase, 2)
+                               if not self.char_set or v[0] in self.char_set)
+            row = 0
+            col = 0
+            char = None
+            allvar = len(variations)*len(functions)
+            status = 1
+            # Every kind of transition has its own group and scene layer, so
+            # they can be selected and hidden at once
+            groups = [bpy.data.groups.get(name) or bpy.data.groups.new(name)
+                      for name in ('transition_cc', 'transition_coc',
+                                   'transition_ct1c', 'transition_ct2c',
+                                   'transition_ct1oc', 'transition_ct2oc',
+                                   'transition_ctotc')]
+            layers = [[i == j for j in range(20)]
+                      for i in range(len(functions))]
+            bounds = 0 < self.bbox_min <= allvar
+            # Transitions which are the same up to a transformation are only
+            # built once, the others are the transformed instances of them
+            shapes = profile_shapes(glyph_profiles(objects, self.transize,
+                                                            self.circsize))
+            built = {}
+            building = 0
+            start = perf_counter()
+            # Get the two characters
+            for char1, char2 in reversed(variations):
+                # Decide whether to start a new Scene or not
+                # based on the first character the second one is combined to
+                if char != char1:
+                    try:
+                        bpy.data.scenes[char1]
+                    except KeyError:
+                        scene = self._newscene(context, char1)
+                        scene.layers = [i < len(functions) for i in range(20)]
+                        char = char1
+                        row = 0
+                        col = 0
+                    # Get the first original character object
+                    obj1 = objects[char1][0]
+
+                # Get the second original character object
+                obj2 = objects[char2][0]
+                # Generate the different transitions
+                for fn, steps, group, layer in zip(functions,
+                                                   grid_steps(char1, char2),
+                                                   groups, layers):
+                    key, transform = variant_key(steps, shapes, circular)
+                    matrix = self._gridmatrix(col, row, len(steps), transform)
+                    # If an equivalent transition is already built, instance
+                    # its mesh transformed to the place of this one
+                    if key in built:
+                        canonical, inverse = built[key]
+                        result = link_result(scene,
+                                             '->'.join(str(s or '(0)')
+                                                       for s in steps),
+                                             canonical.data,
+                                             matrix*inverse*canonical.matrix_basis,
+                                             self.subdsurf, self.lazysubd)
+                        count('transitions instanced')
+                    # If this is the first one of its class, build it
+                    else:
+                        begin = perf_counter()
+                        fn(char1, char2, obj1, obj2, objects, col, row, scene, circular)
+                        building += perf_counter() - begin
+                        result = scene.objects.active
+                        built[key] = result, matrix.inverted()
+                        count('transitions built')
+                    group.objects.link(result)
+                    result.layers = layer
+                    if bounds:
+                        self._bounds(result)
+                    # Increase column based on limit
+                    col += space
+                    if col >= vars_col:
+                        row += space
+                        col = 0
+                    # Put status to stdout
+                    print('STATUS: {:>4} / {}'.format(status, allvar))
+                    yield status, allvar
+                    status += 1
+            # Report the built and the instanced transitions, and the time
+            # saved by the instances
+            seconds   = perf_counter() - start
+            instanced = allvar - len(built)
+            self.report({'INFO'}, '{} transitions in {:.3f}s, {} built, {} '
+                                  'instanced (about {:.3f}s saved)'.format(
+                                      allvar, seconds, len(built), instanced,
+                                      instanced*building/(len(built) or 1)))
+
+        # Deselect original objects
+        for start, trans in objects.values():
+            start.select = False
+            trans.select = False
+
+        # Turn on matcap and set material to matte metal
+        # (there is no 3D View if blender is running in background)
+        if context.space_data:
+            context.space_data.use_matcap = True
+            context.space_data.matcap_icon = '15'
+        # Return if everything went fine
+        return {'FINISHED'}
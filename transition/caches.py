@@ -0,0 +1,142 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from array import array
+from struct import pack, unpack_from
+from os import (environ, getpid, listdir, makedirs, remove, replace, stat,
+                utime)
+from itertools import chain
+from os.path import join, expanduser
+
+# Import transition modules
+from .profiling import count, profiled
+
+
+#------------------------------------------------------------------------------#
+# Cache folder and maximum size (in bytes) of the aligned spans on disk
+CACHE_PATH = environ.get('TRANSITION_CACHE',
+                         join(expanduser('~'), '.cache', 'transition'))
+CACHE_SIZE = int(environ.get('TRANSITION_CACHE_SIZE', 64*1024*1024))
+
+# Bytes of the spans in the cache folders, counted when a folder is listed
+# and increased by every span written by this process since
+_cached = {}
+
+
+@profiled
+def read_span(key):
+    """
+    Returns the steps, the fits of the profiles of the consecutive steps and
+    the profiles of the steps of a cached span, or None if it is not cached
+    (or it is truncated or damaged).
+    """
+    filepath = join(CACHE_PATH, key + '.span')
+    try:
+        with open(filepath, 'rb') as file:
+            data = file.read()
+        # Mark span as recently used
+        utime(filepath)
+    except OSError:
+        return None
+    # Header: signature, number of steps and number of vertices in a loop,
+    # then every step, the fits of every step to the previous one and the
+    # coordinates of the profile of every step
+    if len(data) < 8:
+        return None
+    signature, length, size = unpack_from('<4sHH', data)
+    if (signature != b'TRS4' or length < 2 or
+        len(data) != 8 + length + 48*(length - 1)*size + 24*length*size):
+        return None
+    try:
+        steps = tuple(0 if s == '0' else s for s in data[8:8 + length].decode())
+    except UnicodeDecodeError:
+        return None
+    count('spans read from disk')
+    start = 8 + length + 48*(length - 1)*size
+    fits  = array('d')
+    fits.frombytes(data[8 + length:start])
+    coords = array('d')
+    coords.frombytes(data[start:])
+    # Group fits to pairs, and coordinates to vertices of profiles
+    return (steps,
+            [fits[i:i + 6*size] for i in range(0, len(fits), 6*size)],
+            [tuple(tuple(coords[j:j + 3]) for j in range(i, i + 3*size, 3))
+             for i in range(0, len(coords), 3*size)])
+
+
+@profiled
+def write_span(key, steps, fits, loops):
+    """
+    Stores the steps, the fits of the profiles of the consecutive steps and
+    the profiles (loops) of the steps of a span, then removes the least
+    recently used spans if the cache does not fit into its maximum size.
+    Other processes may share the cache: a span is written to a temporary
+    file and moved into place at once, so they never read it half written,
+    and spans they already removed are skipped.
+    """
+    makedirs(CACHE_PATH, exist_ok=True)
+    data  = pack('<4sHH', b'TRS4', len(steps), len(loops[0]))
+    data += ''.join(str(s) for s in steps).encode()
+    data += array('d', chain(*fits)).tobytes()
+    data += array('d', chain.from_iterable(chain(*loops))).tobytes()
+    filepath  = join(CACHE_PATH, key + '.span')
+    temporary = '{}.{}.tmp'.format(filepath, getpid())
+    with open(temporary, 'wb') as file:
+        file.write(data)
+    replace(temporary, filepath)
+    count('spans written to disk')
+    # The folder is only listed when the spans written since the last listing
+    # could have filled it up
+    total = _cached.get(CACHE_PATH)
+    if total is not None:
+        total = _cached[CACHE_PATH] = total + len(data)
+        if total <= CACHE_SIZE:
+            return
+    # Remove the least recently used spans until the cache fits (into three
+    # quarters of its maximum size once it was full, so the next quarter can
+    # be written without listing the folder again)
+    files = []
+    for name in listdir(CACHE_PATH):
+        if name.endswith('.span'):
+            try:
+                info = stat(join(CACHE_PATH, name))
+            except FileNotFoundError:
+                continue
+            files.append((info.st_mtime, info.st_size, join(CACHE_PATH, name)))
+    files.sort()
+    limit = CACHE_SIZE if total is None else CACHE_SIZE*3//4
+    total = sum(size for _, size, _ in files)
+    for _, size, filepath in files:
+        if total <= limit:
+            break
+        try:
+            remove(filepath)
+        except FileNotFoundError:
+            pass
+        total -= size
+    _cached[CACHE_PATH] = total
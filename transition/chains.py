@@ -0,0 +1,535 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from math import pi, sin, cos
+from array import array
+from struct import pack, unpack_from
+from sys import byteorder
+from string import ascii_lowercase
+from itertools import chain
+
+# Import transition modules
+from .caches import read_span, write_span
+from .meshes import numpy_module
+from .profiling import count, finish, profiled
+
+
+#------------------------------------------------------------------------------#
+def pair_fits(coords1, coords2):
+    """
+    Returns the terms of the fits of coords2 to coords1 in all the orders
+    bridge_order tries: for both directions and all rotations of the second
+    loop, the sums of the products of the matched X and Y coordinates, of the
+    crossed Y and X coordinates, and of the matched Z coordinates.
+    """
+    count = len(coords2)
+    fits  = array('d')
+    for order in (list(range(count)), list(range(count))[::-1]):
+        for offset in range(count):
+            xy = yx = zz = 0
+            for i, (x1, y1, z1) in enumerate(coords1):
+                x2, y2, z2 = coords2[order[(i + offset)%count]]
+                xy += x1*x2 + y1*y2
+                yx += y1*x2 - x1*y2
+                zz += z1*z2
+            fits.extend((xy, yx, zz))
+    return fits
+
+
+def pair_order(index, profiles, symbol1, symbol2, angle=0):
+    """
+    Returns the indices of the profile of symbol2 in the order which fits the
+    profile of symbol1 the best, when it is rotated by angle around the Z axis
+    relative to the first one (as the next profile of a circular chain is).
+    The fits of every pair of templates are only computed once, then they are
+    looked up from the index.
+    """
+    try:
+        fits = index[symbol1, symbol2]
+    except KeyError:
+        count('template pairs indexed')
+        fits = index[symbol1, symbol2] = pair_fits(profiles[symbol1],
+                                                   profiles[symbol2])
+    # The squared distances of the matched vertices add up to the squared
+    # lengths of all of them (which do not depend on the order), minus twice
+    # the sum of their dot products. Rotating the second loop by the angle
+    # turns that sum into cos*xy + sin*yx + zz, and moving both loops by the
+    # same distance (placing them around the circle) only adds a constant to
+    # it, so the best fit of every angle is the one with the largest sum
+    sin_, cos_ = sin(angle), cos(angle)
+    best = max(range(len(fits)//3), key=lambda i: cos_*fits[3*i] +
+                                                  sin_*fits[3*i + 1] +
+                                                  fits[3*i + 2])
+    # Get the direction and the first vertex of the best fit
+    size  = len(fits)//6
+    order = list(range(size))
+    if best >= size:
+        order.reverse()
+    best %= size
+    return order[best:] + order[:best]
+
+
+@profiled
+def span_orders(steps, index, profiles, angle=0):
+    """
+    Returns the orders of the profiles of steps, each one reordered to fit the
+    previous one (rotated by angle relative to it), and the first one in its
+    original order.
+    """
+    # The best fit of a reordered loop is the best fit of the original one
+    # reordered the same way, so the orders of the index can be chained
+    orders = [list(range(len(profiles[steps[0]])))]
+    for step1, step2 in zip(steps, steps[1:]):
+        order = pair_order(index, profiles, step1, step2, angle)
+        orders.append([order[i] for i in orders[-1]])
+    return orders
+
+
+#------------------------------------------------------------------------------#
+_words = {'stamp': None}
+
+@profiled
+def word_chain(text, kerning, stamp, profiles, circular=False):
+    """
+    Returns the symbols of the transition chain of the text with the
+    coordinates of their profiles aligned to each other, profiles returns
+    the profiles of all templates. If circular, the chain is aligned as it
+    is placed around a circle.
+    """
+    return finish(align_chain(text, kerning, stamp, profiles, circular))
+
+
+def align_chain(text, kerning, stamp, profiles, circular=False):
+    """
+    Aligns the transition chain of the text pair by pair: yields the number
+    of aligned and all pairs after every pair, and returns the chain like
+    word_chain does.
+    """
+    from hashlib import sha1
+    # The stamp has to identify the templates and the scales, everything
+    # cached for the previous stamp is dropped
+    cache = _words
+    if cache['stamp'] != stamp:
+        cache.update(stamp=stamp, profiles={}, loaded=False, index={},
+                     spans=set(), angle=None, pairs=(), chain=[], ends=[])
+    spans = cache['spans']
+    index = cache['index']
+    # Profiles of the steps of the spans seen so far, and all of them once
+    # the templates had to be read: profiles is only called if a pair is not
+    # cached in memory or on disk yet, and at most once for every stamp
+    known = cache['profiles']
+    def load():
+        if not cache['loaded']:
+            known.update(profiles())
+            cache['loaded'] = True
+        return known
+    # The pairs are kept with their steps, so a changed kerning table does not
+    # reuse the spans and the chains of its old steps
+    pairs = tuple((pair, kerning[ord(pair[0]) - 97][ord(pair[1]) - 97])
+                  for pair in zip(text, text[1:]))
+    # Linear chains are only moved along a line, which does not change the
+    # alignment of their profiles, but circular ones are aligned as they are
+    # placed around the circle: every profile is rotated by the same angle
+    # relative to the previous one, which depends on the number of segments
+    # of the chain
+    angle = 2*pi/chain_size(text, kerning) if circular else 0
+    # Keep the chain of the common beginning of the previous text (if it is
+    # placed the same way)
+    same = 0
+    for old, new in zip(cache['pairs'] if cache['angle'] == angle else (),
+                        pairs):
+        if old != new:
+            break
+        same += 1
+    ends   = cache['ends'][:same]
+    orders = cache['chain'][:ends[-1] if ends else 0]
+    count('chain pairs reused', len(ends))
+    # Create the chain of the new pairs: the fits of the profiles of the pairs
+    # do not depend on the angle, so they are cached in memory and on disk
+    # (together with the profiles of their steps) for all chains, and only
+    # the best fits are chosen for the angle
+    for pair, steps in pairs[same:]:
+        if (pair, steps) not in spans:
+            key = sha1(repr((pair, steps, stamp)).encode()).hexdigest()
+            try:
+                _, fits, loops = read_span(key)
+                for step, loop in zip(steps, loops):
+                    known.setdefault(step, loop)
+                for step1, step2, fit in zip(steps, steps[1:], fits):
+                    index.setdefault((step1, step2), fit)
+            except TypeError:
+                span_orders(steps, index, load())
+                write_span(key, steps, [index[s] for s in zip(steps, steps[1:])],
+                           [known[s] for s in steps])
+            spans.add((pair, steps))
+        span = span_orders(steps, index, known, angle)
+        # If this is the first pair
+        if not orders:
+            orders.extend(zip(steps, span))
+        # Stitch span to the end of the chain: the first step is the same as
+        # the last one of the chain, if not, the chain is bridged to the second
+        # (the span is reordered so its anchor fits the end of the chain)
+        else:
+            last, order = orders[-1]
+            if steps[0] == last:
+                shift = order
+            else:
+                fit = pair_order(index, known, last, steps[1], angle)
+                inverse = [0]*len(order)
+                for i, j in enumerate(span[1]):
+                    inverse[j] = i
+                shift = [inverse[fit[i]] for i in order]
+            orders.extend((step, [o[i] for i in shift])
+                          for step, o in zip(steps[1:], span[1:]))
+        ends.append(len(orders))
+        yield len(ends), len(pairs)
+    # Store chain for the next text, and return the reordered profiles
+    cache.update(angle=angle, pairs=pairs, chain=orders, ends=ends)
+    return [(step, [known[step][i] for i in order]) for step, order in orders]
+
+
+def chain_size(text, kerning):
+    """
+    Returns the number of segments in the transition chain of the text.
+    """
+    # Every transition starts where the previous one ended
+    return 1 + sum(len(kerning[ord(char1) - 97][ord(char2) - 97]) - 1
+                   for char1, char2 in zip(text, text[1:]))
+
+
+def pair_segments(kerning):
+    """
+    Returns the number of segments every character pair adds to a chain (one
+    less than its steps, as it starts where the previous one ended) keyed by
+    the pairs as strings, like 'ab'. Missing pairs are left out.
+    """
+    return {char1 + char2: len(steps) - 1
+            for char1, row in zip(ascii_lowercase, kerning)
+            for char2, steps in zip(ascii_lowercase, row)
+            if steps is not None}
+
+
+#------------------------------------------------------------------------------#
+# Kinds of the segments, and the glyph id of the circle: the ids of the start
+# and the transition templates of the nth letter are 2*n and 2*n + 1
+START, TRANS, CIRCLE = range(3)
+CIRCLE_GLYPH = 2*len(ascii_lowercase)
+
+
+def glyph_symbol(glyph):
+    """
+    Returns the symbol of the glyph id in the kerning table.
+    """
+    if glyph == CIRCLE_GLYPH:
+        return 0
+    char = ascii_lowercase[glyph//2]
+    return char if glyph%2 else char.upper()
+
+
+def symbol_glyph(symbol):
+    """
+    Returns the glyph id of the symbol in the kerning table.
+    """
+    if symbol == 0:
+        return CIRCLE_GLYPH
+    if symbol.islower():
+        return 2*(ord(symbol) - 97) + 1
+    return 2*(ord(symbol) - 65)
+
+
+class SegmentPlan:
+    """
+    Plan of the segments of transition chains, independent of blender: the
+    glyph id, the kind, the uniform scale (0 keeps the scale of the template),
+    the position and the rotation around the Z axis of every segment, stored
+    in flat typed arrays.
+    """
+    # The arrays of the array module are compact without numpy, and plan_words
+    # fills them from numpy arrays at once if it is installed
+    __slots__ = ('glyphs', 'kinds', 'scales', 'positions', 'rotations')
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def __init__(self):
+        self.glyphs    = array('B')
+        self.kinds     = array('B')
+        self.scales    = array('f')
+        self.positions = array('f')
+        self.rotations = array('f')
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def __len__(self):
+        return len(self.glyphs)
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def __iter__(self):
+        """
+        Yields the glyph id, kind, scale, position and rotation of all segments.
+        """
+        return zip(self.glyphs, self.kinds, self.scales,
+                   zip(*[iter(self.positions)]*3), self.rotations)
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def __eq__(self, other):
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__)
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def append(self, glyph, kind, scale, position, rotation):
+        """
+        Adds a new segment to the end of the plan.
+        """
+        self.glyphs.append(glyph)
+        self.kinds.append(kind)
+        self.scales.append(scale)
+        self.positions.extend(position)
+        self.rotations.append(rotation)
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def diff(self, other):
+        """
+        Returns the indices of the segments which are different in the other
+        plan, including the ones which are missing from either of them.
+        """
+        segments = list(other)
+        indices  = [i for i, segment in enumerate(self)
+                      if i >= len(segments) or segment != segments[i]]
+        return indices + list(range(len(self), len(other)))
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def tobytes(self):
+        """
+        Returns the plan serialised: the signature and the number of segments,
+        then the arrays (in little endian byte order).
+        """
+        data = pack('<4sI', b'TRP1', len(self))
+        for name in self.__slots__:
+            values = array(getattr(self, name).typecode, getattr(self, name))
+            if byteorder == 'big':
+                values.byteswap()
+            data += values.tobytes()
+        return data
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    @classmethod
+    def frombytes(cls, data):
+        """
+        Returns the plan deserialised from data returned by tobytes.
+        """
+        signature, length = unpack_from('<4sI', data)
+        if signature != b'TRP1':
+            raise ValueError('Not a segment plan')
+        plan  = cls()
+        start = 8
+        for name, size in zip(cls.__slots__, (1, 1, 1, 3, 1)):
+            values = getattr(plan, name)
+            end = start + size*length*values.itemsize
+            values.frombytes(data[start:end])
+            if byteorder == 'big':
+                values.byteswap()
+            start = end
+        return plan
+
+
+@profiled
+def plan_text(text, kerning, distance, transize, circsize, circular, plan=None):
+    """
+    Returns the plan of the transition chain of the text along a line (from
+    the origin along the Y axis) or a circle (around the origin, from -distance
+    on the X axis), appended to the given plan or to a new one. Raises a
+    ValueError if a transition is missing.
+    """
+    plan = SegmentPlan() if plan is None else plan
+    first = len(plan)
+    if circular:
+        text += text[0]
+    # Collect the templates of the steps of all pairs
+    glyphs = array('B')
+    for i, (char1, char2) in enumerate(zip(text, text[1:])):
+        steps = kerning[ord(char1) - 97][ord(char2) - 97]
+        if steps is None:
+            raise ValueError('{} -> {}: missing transition'.format(char1,
+                                                                   char2))
+        # Every transition starts where the previous one ended
+        glyphs.extend(map(symbol_glyph, steps[bool(i):]))
+    # Place the segments along a line, or rotate them around a circle
+    angle = 2*pi/len(glyphs) if glyphs else 0
+    for i, glyph in enumerate(glyphs):
+        if glyph == CIRCLE_GLYPH:
+            kind, scale = CIRCLE, circsize
+        elif glyph%2:
+            kind, scale = TRANS, transize
+        else:
+            kind, scale = START, 0
+        if circular:
+            position = -distance*cos(i*angle), -distance*sin(i*angle), 0
+            plan.append(glyph, kind, scale, position, i*angle)
+        else:
+            plan.append(glyph, kind, scale, (0, i*distance, 0), 0)
+    count('segments planned', len(plan) - first)
+    return plan
+
+
+@profiled
+def plan_words(words, kerning, distance, transize, circsize, circular,
+               plan=None):
+    """
+    Returns the plans of the transition chains of the words appended to the
+    given plan or to a new one, like plan_text does word by word, but all of
+    them at once if numpy is installed. Raises a ValueError if a transition
+    is missing.
+    """
+    plan = SegmentPlan() if plan is None else plan
+    numpy = numpy_module()
+    if numpy is None:
+        for word in words:
+            plan_text(word, kerning, distance, transize, circsize, circular,
+                      plan)
+        return plan
+    first = len(plan)
+    # Glyph ids of the steps of all pairs (the pair of the ith and the jth
+    # character is the 26*i + jth one) in one table, where the steps of the
+    # missing pairs are empty
+    pairs  = list(chain(*kerning))
+    sizes  = numpy.array([len(steps or ()) for steps in pairs])
+    starts = numpy.concatenate(([0], numpy.cumsum(sizes)[:-1]))
+    table  = numpy.array([symbol_glyph(step) for steps in pairs
+                                             for step in steps or ()], 'u1')
+    # Character codes of all the words, and the pairs of the consecutive
+    # characters inside the words
+    words = [word + word[0] if circular else word for word in words if word]
+    codes = numpy.frombuffer(''.join(words).encode('ascii'), 'u1') - 97
+    lengths = numpy.array([len(word) for word in words], int)
+    inside  = numpy.ones(len(codes), bool)
+    inside[numpy.cumsum(lengths) - 1] = False
+    keys = (26*codes[:-1].astype(int) + codes[1:])[inside[:-1]]
+    missing = keys[sizes[keys] == 0]
+    if len(missing):
+        char1, char2 = divmod(int(missing[0]), 26)
+        raise ValueError('{} -> {}: missing transition'.format(
+                             ascii_lowercase[char1], ascii_lowercase[char2]))
+    # Every transition starts where the previous one ended, so only the first
+    # pair of a word adds all of its steps
+    owners  = numpy.repeat(numpy.arange(len(words)), lengths - 1)
+    leading = numpy.ones(len(keys), bool)
+    leading[1:] = owners[1:] != owners[:-1]
+    counts  = sizes[keys] - 1 + leading
+    total   = int(counts.sum())
+    offsets = numpy.cumsum(counts) - counts
+    sources = starts[keys] + 1 - leading
+    glyphs  = table[numpy.repeat(sources - offsets, counts) +
+                    numpy.arange(total)]
+    # Index of every segment in its word, and the number of segments of the
+    # words
+    owners   = numpy.repeat(owners, counts)
+    segments = numpy.bincount(owners, minlength=len(words))
+    indices  = numpy.arange(total) - (numpy.cumsum(segments) - segments)[owners]
+    # Kinds and scales of the templates
+    circles = glyphs == CIRCLE_GLYPH
+    kinds   = numpy.where(circles, CIRCLE, numpy.where(glyphs%2, TRANS, START))
+    scales  = numpy.where(circles, circsize,
+                          numpy.where(glyphs%2, transize, 0))
+    # Place the segments along a line, or rotate them around a circle
+    positions = numpy.zeros((total, 3))
+    if circular:
+        rotations = indices*(2*pi/segments)[owners]
+        positions[:, 0] = -distance*numpy.cos(rotations)
+        positions[:, 1] = -distance*numpy.sin(rotations)
+    else:
+        rotations = numpy.zeros(total)
+        positions[:, 1] = indices*distance
+    # Append the arrays of the segments to the plan
+    for values, name in ((glyphs, 'glyphs'), (kinds, 'kinds'),
+                         (scales, 'scales'), (positions, 'positions'),
+                         (rotations, 'rotations')):
+        target = getattr(plan, name)
+        target.frombytes(values.astype(target.typecode).tobytes())
+    count('segments planned', len(plan) - first)
+    return plan
+
+
+#------------------------------------------------------------------------------#
+# Angles of the arcs of the circular test transitions by the number of their
+# segments, in the parts of pi/(min_char/2)
+GRID_ARCS = {2: 2, 3: 1.5, 4: 1.3333333333, 5: 1.25}
+
+
+def grid_steps(char1, char2):
+    """
+    Returns the symbols of the segments of the seven test transitions of the
+    pair in the order of the grid: _cc, _coc, _ct1c, _ct2c, _ct1oc, _ct2oc
+    and _ctotc.
+    """
+    start1, start2 = char1.upper(), char2.upper()
+    return ((start1, start2),
+            (start1, 0, start2),
+            (start1, char1, start2),
+            (start1, char2, start2),
+            (start1, char1, 0, start2),
+            (start1, 0, char2, start2),
+            (start1, char1, 0, char2, start2))
+
+
+def profile_shapes(profiles):
+    """
+    Returns the ids of the shapes of the profiles mirrored along the axes,
+    keyed by their symbols and the scales of the mirroring, like ('a', (1, 1,
+    -1)). Profiles with the same edges (rounded to 4 digits) have the same id.
+    """
+    ids    = {}
+    shapes = {}
+    for symbol, profile in profiles.items():
+        for mirror in ((sx, sy, sz) for sx in (1, -1)
+                                    for sy in (1, -1)
+                                    for sz in (1, -1)):
+            coords = [tuple(round(c*s, 4) for c, s in zip(co, mirror))
+                      for co in profile]
+            edges  = frozenset(frozenset(edge)
+                               for edge in zip(coords, coords[1:] + coords[:1]))
+            shapes[symbol, mirror] = ids.setdefault(edges, len(ids))
+    return shapes
+
+
+def variant_key(steps, shapes, circular):
+    """
+    Returns the key of the class of the transitions, which are the same as
+    the one of the steps up to a transformation, and the transformation of
+    the one of the steps to the key: whether its segments are reversed, and
+    mirrored along the X and the Z axes. Circular transitions can only be
+    reversed, and mirrored along the Z axis.
+    """
+    keys = []
+    for reverse in (False, True):
+        order = steps[::-1] if reverse else steps
+        for mirror_x in ((1,) if circular else (1, -1)):
+            for mirror_z in (1, -1):
+                # Reversing mirrors the segments along their own Y axes
+                mirror = mirror_x, -1 if reverse else 1, mirror_z
+                keys.append((tuple(shapes[step, mirror] for step in order),
+                             (reverse, mirror_x, mirror_z)))
+    # The smallest key of all transformations is the same for the whole class
+    return min(keys)
@@ -0,0 +1,592 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from time import perf_counter
+from os import makedirs, remove, stat
+from sys import stdin, stdout
+from string import ascii_lowercase
+from operator import add
+from itertools import chain
+from collections import Counter
+from os.path import join, dirname, abspath, isfile, splitext
+
+# Import Blender modules (if this is not blender, only the reference backend
+# can be used)
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# Import transition modules
+from . import register
+from .chains import pair_segments
+from .meshes import (MESH_BYTES, WRITERS, edge_loop, lod_chain, mesh_size,
+                     write_lods)
+from .packs import blend_stamp, pack_path, read_pack, write_pack
+from .reference import ReferenceBackend
+from .tables import kerning_path, load_kerning, toascii
+
+
+#------------------------------------------------------------------------------#
+def main(argv):
+    """
+    Command line interface for generating transitions without the user
+    interface, returns the exit code:
+        0: everything was generated and written
+        1: at least one of the words failed
+        2: invalid arguments
+    """
+    from argparse import ArgumentParser
+    parser = ArgumentParser(prog='blender -b ABC.blend --python '
+                                 'transition/__main__.py --'
+                                 if bpy else 'python3 -m transition',
+                            description='Generates character to character '
+                                        'transitions and writes them to files.')
+    parser.add_argument('--words', default='-',
+                        help='file with one text per line, or - for stdin')
+    parser.add_argument('--grid', action='store_true',
+                        help='generate the test transitions instead of words')
+    parser.add_argument('--batch', choices=('grid', 'lines'),
+                        help='generate all the words into one scene, laid out '
+                             'on a grid or along lines')
+    parser.add_argument('--out',
+                        help='folder of the written files')
+    parser.add_argument('--pack', action='store_true',
+                        help='extract the geometry of the templates into a '
+                             'pack next to the blend file, and exit')
+    parser.add_argument('--format', nargs='+',
+                        choices=('blend', 'obj', 'ply', 'glb'),
+                        help='format(s) of the written files (default: blend, '
+                             'or obj with the reference backend)')
+    parser.add_argument('--backend', choices=('blender', 'reference'),
+                        default='blender' if bpy else 'reference',
+                        help='build the words in blender, or from the template '
+                             'pack without blender')
+    parser.add_argument('--templates', metavar='PACK',
+                        help='template pack of the reference backend (default: '
+                             'the pack of the blend file)')
+    parser.add_argument('--lod', type=int, nargs='?', const=2,
+                        metavar='DECIMATED',
+                        help='write the levels of detail of every result into '
+                             'a .lod.glb file as well, with this many '
+                             'decimated variants of the control cage '
+                             '(default: 2)')
+    parser.add_argument('--analyse', type=int, nargs='?', const=10,
+                        metavar='TOP',
+                        help='predict the segments, the geometry and the '
+                             'memory of the words without building them, '
+                             'validate the kerning table and the templates, '
+                             'and print the most expensive pairs (default: '
+                             '10), then exit')
+    parser.add_argument('--stream', action='store_true',
+                        help='remove every result right after it is written, '
+                             'and do not write a blend file')
+    parser.add_argument('--name', default='transitions',
+                        help='name of the written blend file')
+    parser.add_argument('--linear', action='store_true',
+                        help='generate along a linear path')
+    parser.add_argument('--preview', action='store_true',
+                        help='save the results with their control cages '
+                             'displayed only')
+    parser.add_argument('--chars', default='',
+                        help='first characters of the test transitions')
+    parser.add_argument('--profile', metavar='FOLDER',
+                        help='write the profiling reports into this folder')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='write the cProfile statistics as well')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of blender processes building the test '
+                             'transitions, or reference processes building '
+                             'the words in parallel')
+    for name in ('distance', 'transize', 'circsize', 'gap_unit'):
+        parser.add_argument('--' + name, type=float)
+    for name in ('subdsurf', 'vars_col', 'min_char'):
+        parser.add_argument('--' + name, type=int)
+    try:
+        args = parser.parse_args(argv)
+        args.format = args.format or ['blend' if args.backend == 'blender'
+                                      else 'obj']
+        if args.backend == 'blender' and bpy is None:
+            parser.error('the blender backend can only run in blender')
+        if args.backend == 'reference' and (args.grid or args.batch or
+                                            args.pack or args.profile or
+                                            'blend' in args.format):
+            parser.error('the reference backend can only write words into obj, '
+                         'ply and glb files, without profiling')
+        if args.stream and 'blend' in args.format:
+            parser.error('--stream can only write obj, ply and glb files')
+        if not (args.out or args.pack or args.analyse is not None):
+            parser.error('the following arguments are required: --out')
+    except SystemExit as error:
+        return error.code
+    # Extract templates
+    if args.pack:
+        from .blender import template_objects
+        write_pack(pack_path(bpy.data.filepath), template_objects(),
+                   blend_stamp(bpy.data.filepath))
+        return 0
+    # Collect operator properties
+    props = {name: getattr(args, name)
+             for name in ('distance', 'transize', 'circsize', 'gap_unit',
+                          'subdsurf', 'vars_col', 'min_char')
+             if getattr(args, name) is not None}
+    props['circular'] = not args.linear
+    props['lazysubd'] = args.preview
+    props['assembly'] = 'DIRECT'
+    if args.profile:
+        props['profiler'] = abspath(args.profile)
+        props['cprofile'] = args.cprofile
+    # Predict the costs of the words
+    if args.analyse is not None:
+        return analyse(args, props)
+    # Set up output
+    makedirs(args.out, exist_ok=True)
+    # Build words without blender
+    if args.backend == 'reference':
+        return reference(args, props)
+    # Distribute test transitions between worker processes
+    if args.grid and args.workers > 1:
+        return shard(args, props)
+    from .blender import _evaluated, mesh_data, remove_scene
+    register()
+
+    # Build and write a single item, returns the names of the new scenes
+    def build(text, **props):
+        scenes = set(bpy.data.scenes.keys())
+        bpy.ops.mesh.transition_char_to_char(basetext=text, **props)
+        for name in sorted(set(bpy.data.scenes.keys()) - scenes):
+            scene = bpy.data.scenes[name]
+            data  = mesh_data(scene, scene.objects)
+            for format in args.format:
+                if format in WRITERS:
+                    WRITERS[format](join(args.out, '{}.{}'.format(name, format)),
+                                    *data)
+            # Subdivide and decimate the control cages at the levels of the
+            # subdivision modifiers
+            if args.lod is not None:
+                levels = max([modifier.render_levels
+                              for obj in scene.objects
+                              for modifier in obj.modifiers
+                              if modifier.type == 'SUBSURF'] or [0])
+                write_lods(join(args.out, '{}.lod.glb'.format(name)),
+                           lod_chain(*mesh_data(scene, scene.objects, True),
+                                     levels=levels, decimated=args.lod))
+            # If streaming, free the result and its evaluated meshes before
+            # building the next one
+            if args.stream:
+                remove_scene(scene)
+                _evaluated.clear()
+            built.add(name)
+            yield name
+
+    # Build items, and report them
+    failed = 0
+    built  = set(bpy.data.scenes.keys())
+    if args.grid:
+        props['update_g'] = True
+        # If streaming, build the test transitions first character by first
+        # character, so only one of their scenes exists at a time
+        if args.stream:
+            items = [('', c) for c in ascii_lowercase[:-1]
+                             if not args.chars or c in args.chars]
+        else:
+            items = [('', args.chars)]
+    else:
+        items = ((toascii(line.lower()), '')
+                 for line in word_lines(args.words))
+        # If batched, build all words at once
+        if args.batch:
+            props['wordlist'] = args.batch.upper()
+            items = [(' '.join(text for text, _ in items if text), '')]
+    for text, chars in items:
+        # Skip empty lines and texts which were already built
+        if not (text or args.grid) or text in built:
+            continue
+        start = perf_counter()
+        try:
+            names = list(build(text, char_set=chars, **props))
+            status = 'OK'
+        except Exception as error:
+            names  = [text]
+            status = 'FAILED: {}'.format(error).replace('\n', ' ')
+            failed += 1
+        elapsed = perf_counter() - start
+        print('TIME: {:>9.3f}s {} {}'.format(elapsed, ','.join(names), status))
+        # Report throughput of batches
+        if args.batch:
+            words = len(text.split())
+            print('WORDS: {} {:.1f}/s'.format(words, words/(elapsed or 1)))
+        stdout.flush()
+    # Write all results into one blend file
+    if 'blend' in args.format:
+        bpy.ops.wm.save_as_mainfile(filepath=abspath(join(args.out,
+                                                          args.name + '.blend')),
+                                    copy=True)
+    # Return exit code
+    return 1 if failed else 0
+
+
+#------------------------------------------------------------------------------#
+def shard(args, props):
+    """
+    Builds the test transitions in parallel background blender processes,
+    split by their first characters, then merges the results into one blend
+    file. Returns the exit code of the command line interface.
+    """
+    from subprocess import Popen, PIPE
+    from threading import Lock, Thread
+    # Only the characters before 'z' start a test transition, and each of
+    # them has as many pairs as the number of characters after it
+    chars = [c for c in ascii_lowercase[:-1] if not args.chars or c in args.chars]
+    pairs = {c: len(ascii_lowercase) - ascii_lowercase.index(c) - 1 for c in chars}
+    # Give the next heaviest character to the least loaded worker
+    shards = [[0, ''] for i in range(min(args.workers, len(chars)))]
+    for char in chars:
+        least = min(shards)
+        least[0] += pairs[char]
+        least[1] += char
+    # Collect the arguments shared by all workers
+    options = ['--grid', '--out', args.out, '--format'] + args.format
+    options.extend(chain(*(('--' + name, str(value))
+                           for name, value in props.items()
+                           if name not in ('circular', 'assembly', 'char_set',
+                                           'profiler', 'cprofile', 'lazysubd'))))
+    if args.linear:
+        options.append('--linear')
+    if args.stream:
+        options.append('--stream')
+    if args.preview:
+        options.append('--preview')
+    if args.profile:
+        options.extend(('--profile', args.profile))
+    if args.cprofile:
+        options.append('--cprofile')
+    if args.lod is not None:
+        options.extend(('--lod', str(args.lod)))
+    # Start workers
+    workers = []
+    for i, (_, chars) in enumerate(shards):
+        command = [bpy.app.binary_path, '-b', bpy.data.filepath,
+                   '--python', join(dirname(abspath(__file__)), '__main__.py'),
+                   '--',
+                   '--chars', chars,
+                   '--name', '{}-{}'.format(args.name, i)] + options
+        workers.append(Popen(command, stdout=PIPE, universal_newlines=True))
+    # Aggregate the status of the workers
+    lock  = Lock()
+    total = sum(pairs.values())*7
+    done  = [0]
+    def report(worker):
+        for line in worker.stdout:
+            with lock:
+                if line.startswith('STATUS:'):
+                    done[0] += 1
+                    print('STATUS: {:>4} / {}'.format(done[0], total))
+                elif line.startswith('TIME:'):
+                    print(line, end='')
+                stdout.flush()
+    threads = [Thread(target=report, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread, worker in zip(threads, workers):
+        thread.join()
+        worker.wait()
+    # Merge the scenes of the workers into one blend file, and the groups of
+    # the kinds of the transitions into one group of every kind
+    if 'blend' in args.format:
+        filepaths = [abspath(join(args.out, '{}-{}.blend'.format(args.name, i)))
+                     for i in range(len(workers))]
+        filepaths = [filepath for filepath in filepaths if isfile(filepath)]
+        groups = {}
+        for filepath in filepaths:
+            with bpy.data.libraries.load(filepath) as (source, target):
+                target.scenes = [name for name in source.scenes
+                                      if name != '__font__']
+                names = [name for name in source.groups
+                              if name.startswith('transition_')]
+                target.groups = names
+            # Appended groups are renamed if their names are already taken
+            for name, group in zip(names, target.groups):
+                merged = groups.setdefault(name, bpy.data.groups.get(name) or
+                                                 group)
+                if merged != group:
+                    for obj in group.objects:
+                        merged.objects.link(obj)
+                    bpy.data.groups.remove(group)
+        bpy.ops.wm.save_as_mainfile(filepath=abspath(join(args.out,
+                                                          args.name + '.blend')),
+                                    copy=True)
+        for filepath in filepaths:
+            remove(filepath)
+    # Return the worst exit code of the workers
+    return max(worker.returncode for worker in workers)
+
+
+#------------------------------------------------------------------------------#
+# Backend, kerning table and output of a reference worker process
+_worker = {}
+
+def reference_worker(filepath, stamp, out, formats, lod, options):
+    """
+    Sets up a reference worker process: maps the templates of the pack, and
+    loads the kerning table.
+    """
+    _worker.update(backend=ReferenceBackend(read_pack(filepath), stamp,
+                                            **options),
+                   kerning=load_kerning(kerning_path())[0],
+                   out=out,
+                   formats=formats,
+                   lod=lod)
+
+
+def reference_build(text):
+    """
+    Builds and writes the transition of the text in a reference worker
+    process, and returns the text, the elapsed time and the status.
+    """
+    start = perf_counter()
+    backend = _worker['backend']
+    try:
+        # The finest level of detail is the subdivided result
+        if _worker['lod'] is not None:
+            _, verts, faces = backend.build(text, _worker['kerning'], 0)
+            lods = lod_chain(verts, faces, backend.subdsurf, _worker['lod'])
+            write_lods(join(_worker['out'], '{}.lod.glb'.format(text)), lods)
+            verts, faces = lods[-1][1:3]
+        else:
+            _, verts, faces = backend.build(text, _worker['kerning'])
+        for format in _worker['formats']:
+            WRITERS[format](join(_worker['out'], '{}.{}'.format(text, format)),
+                            verts, faces)
+        status = 'OK'
+    except Exception as error:
+        status = 'FAILED: {}'.format(error).replace('\n', ' ')
+    return text, perf_counter() - start, status
+
+
+def template_pack(args):
+    """
+    Returns the path of the template pack of the command line interface: the
+    given one, the pack of the opened blend file, or of the one next to the
+    add-on.
+    """
+    return args.templates or pack_path(
+        bpy.data.filepath if bpy and bpy.data.filepath else
+        join(dirname(dirname(abspath(__file__))), 'ABC.blend'))
+
+
+def word_lines(filepath):
+    """
+    Yields the lines of the file of the words, or of stdin if the filepath is
+    '-'. The file is closed when the lines are exhausted or not needed
+    anymore.
+    """
+    if filepath == '-':
+        yield from stdin
+    else:
+        with open(filepath) as file:
+            yield from file
+
+
+def reference(args, props):
+    """
+    Builds the words with the reference backend, in parallel worker processes
+    if there are more than one. Returns the exit code of the command line
+    interface.
+    """
+    filepath = template_pack(args)
+    # If the blend file of the pack is available, the pack has to be up to date
+    blend = splitext(filepath)[0] + '.blend'
+    try:
+        read_pack(filepath, blend_stamp(blend) if isfile(blend) else None)
+    except (OSError, ValueError) as error:
+        print('FAILED: {}'.format(error))
+        return 1
+    # Aligned spans are cached until the pack is modified
+    stamp = stat(filepath)
+    stamp = filepath, stamp.st_mtime, stamp.st_size
+    options = {name: props[name]
+               for name in ('distance', 'transize', 'circsize', 'subdsurf',
+                            'circular')
+               if name in props}
+    # Skip empty lines and texts which were already built
+    def texts():
+        built = set()
+        for line in word_lines(args.words):
+            text = toascii(line.lower())
+            if text and text not in built:
+                built.add(text)
+                yield text
+    # Build words in this process or in a pool of processes
+    initargs = filepath, stamp, args.out, args.format, args.lod, options
+    if args.workers > 1:
+        from multiprocessing import Pool
+        pool = Pool(args.workers, reference_worker, initargs)
+        results = pool.imap(reference_build, texts(), chunksize=16)
+    else:
+        reference_worker(*initargs)
+        results = map(reference_build, texts())
+    # Report items
+    failed = 0
+    for text, elapsed, status in results:
+        print('TIME: {:>9.3f}s {} {}'.format(elapsed, text, status))
+        failed += status != 'OK'
+        stdout.flush()
+    if args.workers > 1:
+        pool.close()
+        pool.join()
+    # Return exit code
+    return 1 if failed else 0
+
+
+#------------------------------------------------------------------------------#
+def analyse(args, props):
+    """
+    Predicts the segments, the geometry and the memory of the words without
+    building them, and validates the kerning table and the templates. Prints
+    the totals, the largest words and the most expensive pairs, and returns
+    the exit code of the command line interface.
+    """
+    start = perf_counter()
+    kerning, problems = load_kerning(kerning_path())
+    segments = pair_segments(kerning)
+    for (char1, char2), problem in sorted(problems.items()):
+        print('PROBLEM: {} -> {}: {}'.format(char1, char2, problem))
+    # Get the sizes of the profiles of the opened blend file or of the pack
+    if bpy and not args.templates:
+        names = {'_circle'} | {char + kind for char in ascii_lowercase
+                                              for kind in ('_start', '_trans')}
+        sizes = {obj.name: len(edge_loop(obj.data))
+                 for obj in bpy.data.objects if obj.name in names}
+    else:
+        # If the blend file of the pack is available, the pack has to be up to
+        # date
+        filepath = template_pack(args)
+        blend = splitext(filepath)[0] + '.blend'
+        try:
+            pack = read_pack(filepath, blend_stamp(blend) if isfile(blend) else
+                                       None)
+            sizes = {name: len(template.loop) for name, template in pack.items()}
+        except (OSError, ValueError) as error:
+            print('FAILED: {}'.format(error))
+            return 1
+    # Pairs using missing templates cannot be built, and all the profiles
+    # have to be of the same size to be bridged
+    used = set()
+    for pair, steps in ((char1 + char2, steps)
+                        for char1, row in zip(ascii_lowercase, kerning)
+                        for char2, steps in zip(ascii_lowercase, row)
+                        if steps is not None):
+        names = {'_circle' if step == 0 else
+                 step.lower() + ('_trans' if step.islower() else '_start')
+                 for step in steps}
+        missing = names - set(sizes)
+        if missing:
+            print('PROBLEM: {} -> {}: missing template {}'.format(
+                      pair[0], pair[1], ', '.join(sorted(missing))))
+            del segments[pair]
+        used |= names & set(sizes)
+    size = {sizes[name] for name in used}
+    if len(size) != 1:
+        print('FAILED: profiles of {} vertices cannot be bridged'.format(
+                  ', '.join(map(str, sorted(size))) or 'no'))
+        return 1
+    size = size.pop()
+    print('TABLE: {} pairs, {} missing, {} templates of {} vertices'.format(
+              len(segments), 26*26 - len(segments), len(used), size))
+    # Count the words, so every distinct one is only measured once
+    words = Counter(toascii(line.lower()) for line in word_lines(args.words))
+    words.pop('', None)
+    # Get the segments of the words and the uses of the pairs from the
+    # segments of their pairs (and the one closing the circle)
+    circular = props['circular']
+    chains = Counter()
+    pairs  = Counter()
+    failed = Counter()
+    get = segments.__getitem__
+    for word, occurrences in words.items():
+        if word.strip(ascii_lowercase):
+            failed['not a-z'] += occurrences
+            continue
+        text = word + word[0] if circular else word
+        keys = list(map(add, text, text[1:]))
+        try:
+            length = 1 + sum(map(get, keys))
+        except KeyError as error:
+            failed[error.args[0]] += occurrences
+            continue
+        chains[length] += occurrences
+        if occurrences == 1:
+            pairs.update(keys)
+        else:
+            for key in keys:
+                pairs[key] += occurrences
+    # Sizes of the chains at the subdivision level
+    levels = props.get('subdsurf', 3)
+    meshes = {length: mesh_size(length, size, levels, circular)
+              for length in chains}
+    memory = {length: sum(c*b for c, b in zip(mesh, MESH_BYTES))
+              for length, mesh in meshes.items()}
+    built  = sum(chains.values())
+    totals = [sum(meshes[length][i]*chains[length] for length in chains)
+              for i in range(3)]
+    print('WORDS: {} ({} distinct), {} cannot be built'.format(
+              built + sum(failed.values()), len(words), sum(failed.values())))
+    for key, occurrences in failed.most_common():
+        print('FAILED: {} word(s): {}'.format(occurrences,
+                                              '{} -> {}'.format(*key)
+                                              if len(key) == 2 else key))
+    print('TOTAL: {} segments, {} vertices, {} faces, {:.1f} MB'.format(
+              sum(l*c for l, c in chains.items()), totals[0], totals[2],
+              sum(memory[l]*c for l, c in chains.items())/1024/1024))
+    # The largest words decide the memory of the workers
+    seen = 0
+    for length in sorted(chains):
+        seen += chains[length]
+        for name, share in (('MEDIAN', .5), ('P99', .99)):
+            if seen - chains[length] < share*built <= seen:
+                print('{}: {} segments, {} vertices, {} faces, {:.1f} '
+                      'kB'.format(name, length, meshes[length][0],
+                                  meshes[length][2], memory[length]/1024))
+    if chains:
+        length = max(chains)
+        print('MAX: {} segments, {} vertices, {} faces, {:.1f} kB'.format(
+                  length, meshes[length][0], meshes[length][2],
+                  memory[length]/1024))
+    # Most expensive pairs are the ones adding the most segments to the
+    # words, or to a single chain if there are no words
+    ranked = sorted(segments, key=lambda key: (-pairs[key]*segments[key],
+                                               -segments[key], key))
+    for key in ranked[:args.analyse]:
+        print('PAIR: {} -> {}: {} segments, {} uses, {:.1f}% of all '
+              'segments'.format(key[0], key[1], segments[key], pairs[key],
+                                100*pairs[key]*segments[key]/
+                                (sum(l*c for l, c in chains.items()) or 1)))
+    print('TIME: {:>9.3f}s'.format(perf_counter() - start))
+    # Return exit code
+    return 1 if failed else 0
@@ -0,0 +1,647 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from math import pi, sin, cos, sqrt
+from array import array
+from struct import pack
+from sys import byteorder
+from itertools import chain
+
+# Import transition modules
+from .profiling import count, profiled
+
+
+#------------------------------------------------------------------------------#
+def edge_loop(mesh):
+    """
+    Returns the vertex indices of a single closed edge loop mesh in walk order.
+    """
+    # Collect the neighbours of all vertices
+    edges = array('i', [0])*(2*len(mesh.edges))
+    mesh.edges.foreach_get('vertices', edges)
+    links = {}
+    for v1, v2 in zip(edges[::2], edges[1::2]):
+        links.setdefault(v1, []).append(v2)
+        links.setdefault(v2, []).append(v1)
+    # Walk along the loop starting from the lowest vertex index
+    first = prev = min(links)
+    loop = [first]
+    vert = links[first][0]
+    while vert != first:
+        loop.append(vert)
+        v1, v2 = links[vert]
+        prev, vert = vert, v2 if v1 == prev else v1
+    # Return ordered indices
+    return loop
+
+
+#------------------------------------------------------------------------------#
+def bridge_order(coords1, coords2):
+    """
+    Returns the indices of coords2 in the order which fits coords1 the best.
+    """
+    count = len(coords2)
+    best  = None
+    # Try both directions and all rotations of the second loop
+    for order in (list(range(count)), list(range(count))[::-1]):
+        for offset in range(count):
+            cost = 0
+            for i, (x1, y1, z1) in enumerate(coords1):
+                x2, y2, z2 = coords2[order[(i + offset)%count]]
+                cost += (x1 - x2)**2 + (y1 - y2)**2 + (z1 - z2)**2
+            if best is None or cost < best[0]:
+                best = cost, order[offset:] + order[:offset]
+    # Return aligned indices
+    return best[1]
+
+
+#------------------------------------------------------------------------------#
+def bridge_faces(coords, size, closed):
+    """
+    Returns the flat vertex indices of the quads bridging each loop of the
+    flat buffer of the aligned vertex coordinates (size vertices each) to the
+    next one (and the last one to the first if closed).
+    """
+    verts = len(coords)//3
+    # Vertex indices of the quads between the first two loops (foreach_set
+    # reads the buffers of the array module directly)
+    quads = array('i', chain(*((i,
+                                (i + 1)%size,
+                                size + (i + 1)%size,
+                                size + i) for i in range(size))))
+    faces = array('i')
+    for start in range(0, verts - size, size):
+        faces.extend(array('i', [index + start for index in quads]))
+    # If closed, the first loop has to be aligned to the last one as well
+    if closed:
+        last  = list(zip(*[iter(coords[-3*size:])]*3))
+        first = list(zip(*[iter(coords[:3*size])]*3))
+        order = bridge_order(last, first)
+        start = verts - size
+        faces.extend(array('i', chain(*((start + i,
+                                         start + (i + 1)%size,
+                                         order[(i + 1)%size],
+                                         order[i]) for i in range(size)))))
+    # Return indices
+    return faces
+
+
+#------------------------------------------------------------------------------#
+# The numpy module if it is installed, imported by the first subdivision (it is
+# optional, as it is only used to speed up the subdivision in the reference
+# backend, and the pure Python subdivision gives the same results)
+_numpy = []
+
+def numpy_module():
+    """
+    Returns the numpy module, or None if it is not installed.
+    """
+    if not _numpy:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy.append(numpy)
+    return _numpy[0]
+
+
+#------------------------------------------------------------------------------#
+@profiled
+def subdivide(coords, faces, levels):
+    """
+    Returns the flat vertex coordinates and the faces of the mesh subdivided
+    levels times with the Catmull-Clark rules, the boundaries are kept smooth.
+    The original vertices come first, then the face points and the edge
+    points of each level.
+    """
+    # Subdivide the whole mesh at once if numpy is available and the faces
+    # have the same number of vertices (as the bridged quads do)
+    numpy = numpy_module()
+    if numpy is not None and levels and len(set(map(len, faces))) == 1:
+        return subdivide_arrays(numpy, coords, faces, levels)
+    for level in range(levels):
+        xs, ys, zs = coords[0::3], coords[1::3], coords[2::3]
+        verts = len(xs)
+        # Face points are the centroids of the faces
+        fxs, fys, fzs = [], [], []
+        for face in faces:
+            fxs.append(sum([xs[i] for i in face])/len(face))
+            fys.append(sum([ys[i] for i in face])/len(face))
+            fzs.append(sum([zs[i] for i in face])/len(face))
+        # Number the edges, and collect their faces and the edges of the faces
+        edges = {}
+        ends  = []
+        sides = []
+        rims  = []
+        for f, face in enumerate(faces):
+            rim = []
+            for v1, v2 in zip(face, face[1:] + face[:1]):
+                key = (v1, v2) if v1 < v2 else (v2, v1)
+                try:
+                    e = edges[key]
+                    sides[e].append(f)
+                except KeyError:
+                    e = edges[key] = len(ends)
+                    ends.append(key)
+                    sides.append([f])
+                rim.append(e)
+            rims.append(rim)
+        # Edge points are the averages of the ends and the face points of the
+        # edges, or the midpoints of the boundary edges, and the vertices
+        # collect the sums of their neighbours
+        exs, eys, ezs = [], [], []
+        links   = [0]*verts
+        nxs     = [0.0]*verts
+        nys     = [0.0]*verts
+        nzs     = [0.0]*verts
+        borders = [0]*verts
+        bxs     = [0.0]*verts
+        bys     = [0.0]*verts
+        bzs     = [0.0]*verts
+        for (v1, v2), adjacent in zip(ends, sides):
+            x, y, z = xs[v1] + xs[v2], ys[v1] + ys[v2], zs[v1] + zs[v2]
+            for v, o in ((v1, v2), (v2, v1)):
+                links[v] += 1
+                nxs[v] += xs[o]
+                nys[v] += ys[o]
+                nzs[v] += zs[o]
+            if len(adjacent) == 2:
+                f1, f2 = adjacent
+                exs.append((x + fxs[f1] + fxs[f2])/4)
+                eys.append((y + fys[f1] + fys[f2])/4)
+                ezs.append((z + fzs[f1] + fzs[f2])/4)
+                continue
+            exs.append(x/2)
+            eys.append(y/2)
+            ezs.append(z/2)
+            if len(adjacent) == 1:
+                for v, o in ((v1, v2), (v2, v1)):
+                    borders[v] += 1
+                    bxs[v] += xs[o]
+                    bys[v] += ys[o]
+                    bzs[v] += zs[o]
+        # Vertex points are the weighted averages of their neighbourhoods
+        valences = [0]*verts
+        cxs = [0.0]*verts
+        cys = [0.0]*verts
+        czs = [0.0]*verts
+        for f, face in enumerate(faces):
+            for v in face:
+                valences[v] += 1
+                cxs[v] += fxs[f]
+                cys[v] += fys[f]
+                czs[v] += fzs[f]
+        for v in range(verts):
+            # Boundary vertices only depend on their boundary neighbours
+            b = borders[v]
+            if b:
+                xs[v] = (6*xs[v] + bxs[v])/(6 + b)
+                ys[v] = (6*ys[v] + bys[v])/(6 + b)
+                zs[v] = (6*zs[v] + bzs[v])/(6 + b)
+                continue
+            n, k = valences[v], links[v]
+            if not n:
+                continue
+            xs[v] = (cxs[v]/n + nxs[v]/k + (k - 2)*xs[v])/k
+            ys[v] = (cys[v]/n + nys[v]/k + (k - 2)*ys[v])/k
+            zs[v] = (czs[v]/n + nzs[v]/k + (k - 2)*zs[v])/k
+        # Every face is split into quads around its face point
+        edge = verts + len(faces)
+        subdivided = []
+        for f, (face, rim) in enumerate(zip(faces, rims)):
+            center = verts + f
+            for i, vert in enumerate(face):
+                subdivided.append((vert, edge + rim[i], center,
+                                   edge + rim[i - 1]))
+        coords = array('f', [0])*(3*(edge + len(ends)))
+        coords[0::3] = array('f', chain(xs, fxs, exs))
+        coords[1::3] = array('f', chain(ys, fys, eys))
+        coords[2::3] = array('f', chain(zs, fzs, ezs))
+        faces = subdivided
+    # Return subdivided mesh
+    return coords, faces
+
+
+#------------------------------------------------------------------------------#
+def subdivide_arrays(numpy, coords, faces, levels):
+    """
+    Returns the same subdivided mesh as subdivide, computed with numpy from the
+    faces of the same number of vertices.
+    """
+    # Sums of the rows of the values which have the same index
+    def gather(index, values, size):
+        return numpy.stack([numpy.bincount(index, values[:, i], size)
+                            for i in range(3)], axis=1)
+    points = numpy.array(coords, dtype=numpy.float64).reshape(-1, 3)
+    faces  = numpy.array(faces, dtype=numpy.int64)
+    for level in range(levels):
+        verts = len(points)
+        count, sides = faces.shape
+        # Face points are the centroids of the faces
+        centers = points[faces].sum(axis=1)/sides
+        # Number the edges in the order of their first sides, as subdivide does
+        starts = faces.ravel()
+        stops  = numpy.roll(faces, -1, axis=1).ravel()
+        lows   = numpy.minimum(starts, stops)
+        highs  = numpy.maximum(starts, stops)
+        keys, firsts, inverse = numpy.unique(lows*verts + highs,
+                                             return_index=True,
+                                             return_inverse=True)
+        order = numpy.argsort(firsts)
+        ranks = numpy.empty_like(order)
+        ranks[order] = numpy.arange(len(order))
+        rims  = ranks[inverse.ravel()].reshape(count, sides)
+        ends  = numpy.stack((lows[firsts[order]], highs[firsts[order]]),
+                            axis=1)
+        edges = len(ends)
+        # Edge points are the averages of the ends and the face points of the
+        # edges, or the midpoints of the boundary edges
+        adjacent = numpy.bincount(rims.ravel(), minlength=edges)
+        owners   = numpy.repeat(numpy.arange(count), sides)
+        sums     = points[ends[:, 0]] + points[ends[:, 1]]
+        around   = gather(rims.ravel(), centers[owners], edges)
+        middles  = numpy.where((adjacent == 2)[:, None],
+                               (sums + around)/4, sums/2)
+        # The vertices collect the sums of their neighbours, their boundary
+        # neighbours and the face points around them
+        both   = numpy.concatenate((ends[:, 0], ends[:, 1]))
+        others = numpy.concatenate((ends[:, 1], ends[:, 0]))
+        links  = numpy.bincount(both, minlength=verts)[:, None]
+        near   = gather(both, points[others], verts)
+        rim    = numpy.tile(adjacent == 1, 2)
+        borders = numpy.bincount(both[rim], minlength=verts)[:, None]
+        outer  = gather(both[rim], points[others[rim]], verts)
+        valences = numpy.bincount(starts, minlength=verts)[:, None]
+        faced  = gather(starts, centers[owners], verts)
+        # Vertex points are the weighted averages of their neighbourhoods, the
+        # boundary vertices only depend on their boundary neighbours
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            inner = (faced/valences + near/links + (links - 2)*points)/links
+            outer = (6*points + outer)/(6 + borders)
+        points = numpy.where(borders > 0, outer,
+                             numpy.where(valences > 0, inner, points))
+        # Every face is split into quads around its face point
+        edge  = verts + count
+        faces = numpy.stack((faces,
+                             edge + rims,
+                             numpy.broadcast_to(verts + numpy.arange(count)[:, None],
+                                                faces.shape),
+                             edge + numpy.roll(rims, 1, axis=1)),
+                            axis=2).reshape(-1, 4)
+        # The coordinates are stored in single precision after every level
+        points = numpy.concatenate((points, centers, middles))
+        points = points.astype(numpy.float32).astype(numpy.float64)
+    # Return subdivided mesh
+    return (array('f', points.astype(numpy.float32).tobytes()),
+            list(map(tuple, faces.tolist())))
+
+
+#------------------------------------------------------------------------------#
+def decimate(coords, faces, cell):
+    """
+    Returns the flat vertex coordinates and the faces of the mesh simplified
+    by clustering its vertices into cubic cells of the given size: the
+    vertices of a cell are merged into their average, the collapsed and the
+    duplicated faces are dropped, and so are the vertices left without faces.
+    """
+    cells = {}
+    sums  = []
+    remap = array('i')
+    for x, y, z in zip(*[iter(coords)]*3):
+        key = x//cell, y//cell, z//cell
+        try:
+            i = cells[key]
+        except KeyError:
+            i = cells[key] = len(sums)
+            sums.append([0, 0, 0, 0])
+        total = sums[i]
+        total[0] += x
+        total[1] += y
+        total[2] += z
+        total[3] += 1
+        remap.append(i)
+    # Faces keep their merged corners in order
+    kept = set()
+    simplified = []
+    for face in faces:
+        corners = []
+        for v in face:
+            if remap[v] not in corners:
+                corners.append(remap[v])
+        key = frozenset(corners)
+        if len(corners) > 2 and key not in kept:
+            kept.add(key)
+            simplified.append(corners)
+    # Number the merged vertices which are still used by faces
+    used = {}
+    for corners in simplified:
+        for i, v in enumerate(corners):
+            try:
+                corners[i] = used[v]
+            except KeyError:
+                corners[i] = used[v] = len(used)
+    merged = [None]*len(used)
+    for v, i in used.items():
+        x, y, z, n = sums[v]
+        merged[i] = x/n, y/n, z/n
+    # Return simplified mesh
+    return (array('f', chain(*merged)),
+            [tuple(corners) for corners in simplified])
+
+
+def profile_edge_length(coords, faces):
+    """
+    Returns the average length of the edges along the profiles: of the
+    shorter pair of the opposite edges of the quads (the bridges between the
+    profiles are the longer ones), and of the shortest edge of other faces.
+    """
+    total = 0
+    for face in faces:
+        lengths = [sqrt((coords[3*v1]     - coords[3*v2])**2 +
+                        (coords[3*v1 + 1] - coords[3*v2 + 1])**2 +
+                        (coords[3*v1 + 2] - coords[3*v2 + 2])**2)
+                   for v1, v2 in zip(face, face[1:] + face[:1])]
+        if len(lengths) == 4:
+            total += min(lengths[0] + lengths[2], lengths[1] + lengths[3])/2
+        else:
+            total += min(lengths)
+    return total/(len(faces) or 1)
+
+
+#------------------------------------------------------------------------------#
+# Height of the viewport in pixels, and the length of the edges of a level of
+# detail in pixels, from which the next finer level is used
+LOD_HEIGHT = 1080
+LOD_PIXELS = 8
+# Minimum share of the faces of the next finer level a decimated level keeps
+LOD_SHARE = 1/4
+
+@profiled
+def lod_chain(coords, faces, levels, decimated):
+    """
+    Returns the levels of detail of the control cage from the coarsest to the
+    finest: the decimated variants of the cage, the cage itself and its
+    subdivided levels, each one computed from the previous one. Every level
+    is the name, the flat vertex coordinates, the faces and the screen size
+    (the size of the mesh relative to the height of the viewport) from which
+    the level is used. Decimated variants which would keep less than
+    LOD_SHARE of the faces of the next finer level are left out.
+    """
+    lods = [('cage', coords, faces)]
+    for level in range(levels):
+        coords, faces = subdivide(coords, faces, 1)
+        lods.append(('subdivided {}'.format(level + 1), coords, faces))
+    # Every decimated variant merges the vertices in twice as big cells, which
+    # are based on the edges along the profiles, as the bridges between the
+    # profiles are much longer, and cells of their size would collapse them
+    coords, faces = lods[0][1:]
+    edge = profile_edge_length(coords, faces)
+    for level in range(decimated):
+        variant = decimate(coords, faces, edge*2**(level + 1))
+        if len(variant[1]) < LOD_SHARE*len(lods[0][2]):
+            count('levels of detail left out', decimated - level)
+            break
+        lods.insert(0, ('decimated {}'.format(level + 1),) + variant)
+    # Size of the mesh is the diagonal of its bounding box
+    size = sqrt(sum((max(coords[i::3]) - min(coords[i::3]))**2
+                    for i in range(3)))
+    # A level is used from where the edges of the previous one get too long
+    screen = 0
+    for i, (name, coords, faces) in enumerate(lods):
+        lods[i] = name, coords, faces, screen
+        screen = LOD_PIXELS*size/((profile_edge_length(coords, faces) or 1)*
+                                  LOD_HEIGHT)
+    count('levels of detail', len(lods))
+    return lods
+
+
+#------------------------------------------------------------------------------#
+# Bytes of a vertex, an edge and a quad (a polygon and its four loops) in the
+# mesh data of blender
+MESH_BYTES = 20, 12, 44
+
+
+def mesh_size(segments, size, levels, circular):
+    """
+    Returns the number of vertices, edges and faces of a transition chain of
+    segments profiles of size vertices each, subdivided levels times, without
+    building it: every quad is split into four, and every edge into two.
+    """
+    # Every profile is bridged to the next one (and the last to the first
+    # if the chain is closed)
+    bridges = segments if circular else segments - 1
+    verts = segments*size
+    edges = (segments + bridges)*size
+    faces = bridges*size
+    for level in range(levels):
+        verts, edges, faces = verts + edges + faces, 2*edges + 4*faces, 4*faces
+    return verts, edges, faces
+
+
+#------------------------------------------------------------------------------#
+@profiled
+def place_chain(loops, distance, circular):
+    """
+    Returns the aligned profiles of the chain placed around a circle (from
+    -distance on the X axis around the origin) or along the Y axis (ending in
+    the origin) as a flat vertex buffer, and the distance of the origin from
+    the first profile along the Y axis.
+    """
+    d = distance
+    # Origin is the center of the circle or the last profile of the line
+    last = 0 if circular else (len(loops) - 1)*d
+    # Place the profiles into a single preallocated vertex buffer
+    size   = 3*len(loops[0][1])
+    step   = 2*pi/len(loops)
+    coords = array('f', [0])*(size*len(loops))
+    for i, (_, loop) in enumerate(loops):
+        if circular:
+            sin_, cos_ = sin(i*step), cos(i*step)
+            placed = (((x - d)*cos_ - y*sin_, (x - d)*sin_ + y*cos_, z)
+                      for x, y, z in loop)
+        else:
+            offset = i*d - last
+            placed = ((x, y + offset, z) for x, y, z in loop)
+        coords[i*size:(i + 1)*size] = array('f', chain(*placed))
+    # Return placed vertices and origin
+    return coords, last
+
+
+#------------------------------------------------------------------------------#
+def offset_faces(polygons, offset, mirrored=False):
+    """
+    Returns the faces with their vertex indices offset, and if mirrored (placed
+    by a matrix with a negative determinant, which turns them inside out) with
+    the order of their vertices reversed, so they keep facing outwards.
+    """
+    if mirrored:
+        return [tuple(offset + i for i in poly[:1] + poly[:0:-1])
+                for poly in polygons]
+    return [tuple(offset + i for i in poly) for poly in polygons]
+
+
+#------------------------------------------------------------------------------#
+def write_obj(filepath, verts, faces):
+    """
+    Writes flat vertex coordinates and faces to a Wavefront OBJ file.
+    """
+    with open(filepath, 'w') as file:
+        file.writelines('v {:.6f} {:.6f} {:.6f}\n'.format(*co)
+                        for co in zip(*[iter(verts)]*3))
+        file.writelines('f {}\n'.format(' '.join(str(i + 1) for i in face))
+                        for face in faces)
+
+
+#------------------------------------------------------------------------------#
+def write_ply(filepath, verts, faces):
+    """
+    Writes flat vertex coordinates and faces to a binary PLY file.
+    """
+    header = ('ply\n'
+              'format binary_{}_endian 1.0\n'
+              'element vertex {}\n'
+              'property float x\n'
+              'property float y\n'
+              'property float z\n'
+              'element face {}\n'
+              'property list uchar int vertex_indices\n'
+              'end_header\n').format(byteorder, len(verts)//3, len(faces))
+    with open(filepath, 'wb') as file:
+        file.write(header.encode('ascii'))
+        file.write(array('f', verts).tobytes())
+        # Faces of the same size are written at once with numpy (which takes
+        # 14 ms instead of 35 ms for the 36800 quads of a word of 9 letters)
+        numpy = numpy_module()
+        if numpy is not None and len(set(map(len, faces))) == 1:
+            records = numpy.empty(len(faces), dtype=[('size', 'u1'),
+                                                      ('indices', 'i4',
+                                                       len(faces[0]))])
+            records['size'] = len(faces[0])
+            records['indices'] = faces
+            records.tofile(file)
+        # Otherwise in chunks, so the whole list is never packed
+        else:
+            for i in range(0, len(faces), 4096):
+                file.write(b''.join(pack('=B{}i'.format(len(face)),
+                                         len(face), *face)
+                                    for face in faces[i:i + 4096]))
+
+
+#------------------------------------------------------------------------------#
+def write_glb(filepath, verts, faces):
+    """
+    Writes flat vertex coordinates and faces to a binary glTF 2.0 file.
+    """
+    write_lods(filepath, [(None, verts, faces, None)])
+
+
+def write_lods(filepath, levels):
+    """
+    Writes the levels of detail of a mesh (from the coarsest to the finest)
+    to a binary glTF 2.0 file. Every level is the name, the flat vertex
+    coordinates, the faces and the screen size from which the level is used.
+    The finest level is the node of the scene, and if there are coarser ones,
+    they are linked to it by the MSFT_lod extension. The data of the coarser
+    levels come first in the buffer, so they can be streamed first.
+    """
+    header = {'asset'      : {'version': '2.0'},
+              'scene'      : 0,
+              'scenes'     : [{'nodes': [len(levels) - 1]}],
+              'nodes'      : [],
+              'meshes'     : [],
+              'buffers'    : [],
+              'bufferViews': [],
+              'accessors'  : []}
+    data = b''
+    for i, (name, verts, faces, screen) in enumerate(levels):
+        # Convert Z up to Y up and triangulate faces as fans
+        points = array('f', verts)
+        points[1::3] = verts[2::3]
+        points[2::3] = array('f', (-y for y in verts[1::3]))
+        verts = list(zip(*[iter(points)]*3))
+        points = pack('<{}f'.format(len(points)), *points)
+        # Faces of the same size are triangulated at once with numpy
+        numpy = numpy_module()
+        if numpy is not None and len(set(map(len, faces))) == 1:
+            fans = [index for j in range(1, len(faces[0]) - 1)
+                          for index in (0, j, j + 1)]
+            tris = numpy.array(faces, dtype='<u4')[:, fans].ravel()
+            indices = tris.tobytes()
+        else:
+            tris = [index for face in faces
+                          for j in range(1, len(face) - 1)
+                          for index in (face[0], face[j], face[j + 1])]
+            indices = pack('<{}I'.format(len(tris)), *tris)
+        # Describe the part of the binary buffer
+        mesh = {'primitives': [{'attributes': {'POSITION': 2*i},
+                                'indices': 2*i + 1}]}
+        if name is not None:
+            mesh['name'] = name
+            mesh['extras'] = {'polygons': len(faces), 'screen_size': screen}
+        header['nodes'].append({'mesh': i})
+        header['meshes'].append(mesh)
+        header['bufferViews'].extend(({'buffer': 0,
+                                       'byteOffset': len(data),
+                                       'byteLength': len(points),
+                                       'target': 34962},
+                                      {'buffer': 0,
+                                       'byteOffset': len(data) + len(points),
+                                       'byteLength': len(indices),
+                                       'target': 34963}))
+        header['accessors'].extend(({'bufferView': 2*i,
+                                     'componentType': 5126,
+                                     'count': len(verts),
+                                     'type': 'VEC3',
+                                     'min': [min(c) for c in zip(*verts)],
+                                     'max': [max(c) for c in zip(*verts)]},
+                                    {'bufferView': 2*i + 1,
+                                     'componentType': 5125,
+                                     'count': len(tris),
+                                     'type': 'SCALAR'}))
+        data += points + indices
+    header['buffers'].append({'byteLength': len(data)})
+    # The finest level lists the coarser ones from the finest to the coarsest
+    if len(levels) > 1:
+        header['extensionsUsed'] = ['MSFT_lod']
+        header['nodes'][-1]['extensions'] = \
+            {'MSFT_lod': {'ids': list(range(len(levels) - 2, -1, -1))}}
+        header['nodes'][-1]['extras'] = \
+            {'MSFT_screencoverage': [level[3] for level in reversed(levels)]}
+    # Chunks have to be aligned to 4 bytes
+    from json import dumps
+    text = dumps(header).encode('utf-8')
+    text += b' '*(-len(text)%4)
+    with open(filepath, 'wb') as file:
+        file.write(pack('<4sII', b'glTF', 2, 28 + len(text) + len(data)))
+        file.write(pack('<I4s', len(text), b'JSON') + text)
+        file.write(pack('<I4s', len(data), b'BIN\0') + data)
+
+
+#------------------------------------------------------------------------------#
+# Writers of the mesh file formats
+WRITERS = {'obj': write_obj, 'ply': write_ply, 'glb': write_glb}
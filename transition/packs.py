@@ -0,0 +1,183 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from math import sqrt
+from array import array
+from struct import pack, calcsize, unpack_from
+from sys import byteorder
+from string import ascii_lowercase
+from itertools import chain
+from collections import namedtuple
+from os.path import splitext
+
+# Import transition modules
+from .meshes import edge_loop
+from .profiling import count, profiled
+
+
+#------------------------------------------------------------------------------#
+# Geometry of a template read from a pack: the coordinates of its vertices,
+# the vertex pairs of its edges, the number of corners of its faces and
+# their vertices, its edge loop in walk order and its 4x4 transformation
+Template = namedtuple('Template', ('name', 'coords', 'edges', 'faces',
+                                   'corners', 'loop', 'matrix'))
+# Sizes of the name and the counts of a template in the directory of a pack
+PACK_NAME  = 32
+PACK_ENTRY = '<{}s6I16f'.format(PACK_NAME)
+
+
+def blend_stamp(filepath):
+    """
+    Returns the digest of the content of the blend file.
+    """
+    from hashlib import sha1
+    with open(filepath, 'rb') as file:
+        return sha1(file.read()).digest()
+
+
+def pack_path(filepath):
+    """
+    Returns the path of the template pack of the blend file.
+    """
+    return splitext(filepath)[0] + '.pack'
+
+
+@profiled
+def write_pack(filepath, objects, stamp):
+    """
+    Writes the geometry of the templates into a binary pack: the signature,
+    the stamp of the blend file and the number of templates, the directory of
+    the names, counts, data offsets and transformations of the templates, then
+    their data as 4 byte little endian floats and integers.
+    """
+    templates = []
+    for obj in chain(*(objects[key] for key in sorted(objects, key=str))):
+        if obj in templates:
+            continue
+        templates.append(obj)
+    header = pack('<4s20sI', b'TRT1', stamp, len(templates))
+    offset = len(header) + len(templates)*calcsize(PACK_ENTRY)
+    entries = []
+    data = []
+    for obj in templates:
+        mesh = obj.data
+        arrays = (array('f', [0])*(3*len(mesh.vertices)),
+                  array('I', [0])*(2*len(mesh.edges)),
+                  array('I', [0])*len(mesh.polygons),
+                  array('I', [0])*len(mesh.loops))
+        mesh.vertices.foreach_get('co', arrays[0])
+        mesh.edges.foreach_get('vertices', arrays[1])
+        mesh.polygons.foreach_get('loop_total', arrays[2])
+        mesh.loops.foreach_get('vertex_index', arrays[3])
+        arrays += (array('I', edge_loop(mesh) if mesh.edges else ()),)
+        entries.append(pack(PACK_ENTRY, obj.name.encode('utf-8'), offset,
+                            *[len(a) for a in arrays] +
+                             list(chain(*obj.matrix_basis))))
+        for values in arrays:
+            if byteorder == 'big':
+                values.byteswap()
+            data.append(values.tobytes())
+            offset += len(data[-1])
+    with open(filepath, 'wb') as file:
+        file.write(header)
+        file.writelines(entries)
+        file.writelines(data)
+
+
+@profiled
+def read_pack(filepath, stamp=None):
+    """
+    Returns the templates of a pack keyed by their names. The arrays of the
+    templates are views of the memory mapped file. If the stamp of the blend
+    file is given, and the pack was extracted from a different content, a
+    ValueError is raised.
+    """
+    from mmap import mmap, ACCESS_READ
+    with open(filepath, 'rb') as file:
+        data = mmap(file.fileno(), 0, access=ACCESS_READ)
+    signature, packed, length = unpack_from('<4s20sI', data)
+    if signature != b'TRT1':
+        raise ValueError('Not a template pack: {}'.format(filepath))
+    if stamp is not None and stamp != packed:
+        raise ValueError('Template pack is out of date: {}'.format(filepath))
+    view = memoryview(data)
+    templates = {}
+    for i in range(length):
+        name, offset, *values = unpack_from(PACK_ENTRY, data,
+                                            calcsize('<4s20sI') +
+                                            i*calcsize(PACK_ENTRY))
+        sizes, matrix = values[:5], values[5:]
+        matrix = tuple(tuple(matrix[j:j + 4]) for j in range(0, 16, 4))
+        arrays = []
+        for typecode, size in zip('fIIII', sizes):
+            end = offset + 4*size
+            # Views are only possible in the native byte order
+            if byteorder == 'big':
+                values = array(typecode, view[offset:end].tobytes())
+                values.byteswap()
+            else:
+                values = view[offset:end].cast(typecode)
+            arrays.append(values)
+            offset = end
+        name = name.rstrip(b'\0').decode('utf-8')
+        templates[name] = Template(name, *arrays, matrix=matrix)
+    count('templates mapped', length)
+    return templates
+
+
+def pack_profile(template, scale=None):
+    """
+    Returns the coordinates of the edge loop of the template in walk order,
+    rotated and scaled like the template, or only rotated like the template
+    and scaled uniformly by scale.
+    """
+    # The columns of the transformation are the axes of the template
+    axes = [[template.matrix[i][j] for i in range(3)] for j in range(3)]
+    if scale is not None:
+        axes = [[c*scale/sqrt(sum(c*c for c in axis)) for c in axis]
+                for axis in axes]
+    (xx, xy, xz), (yx, yy, yz), (zx, zy, zz) = axes
+    coords = template.coords
+    return tuple((coords[3*i]*xx + coords[3*i + 1]*yx + coords[3*i + 2]*zx,
+                  coords[3*i]*xy + coords[3*i + 1]*yy + coords[3*i + 2]*zy,
+                  coords[3*i]*xz + coords[3*i + 1]*yz + coords[3*i + 2]*zz)
+                 for i in template.loop)
+
+
+@profiled
+def pack_profiles(templates, transize, circsize):
+    """
+    Returns the profiles of all templates of a pack keyed by their symbols in
+    the kerning table, like glyph_profiles does for the template objects.
+    """
+    profiles = {}
+    for char in ascii_lowercase:
+        profiles[char.upper()] = pack_profile(templates[char + '_start'])
+        profiles[char] = pack_profile(templates[char + '_trans'], transize)
+    profiles[0] = pack_profile(templates['_circle'], circsize)
+    return profiles
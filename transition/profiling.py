@@ -0,0 +1,159 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from time import perf_counter, strftime
+from contextlib import contextmanager
+from os import getpid, makedirs
+from os.path import join
+
+# Import Blender modules (only the profiled executions of the operators count
+# the meshes they orphaned)
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+
+#------------------------------------------------------------------------------#
+def finish(steps):
+    """
+    Runs the generator of the steps to its end, and returns its result.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as result:
+            return result.value
+
+
+#------------------------------------------------------------------------------#
+# Stages and counters of the running profiled execution (None if not profiled)
+_profile = None
+
+def count(name, value=1):
+    """
+    Increases the counter of the profiled execution.
+    """
+    if _profile is not None:
+        counters = _profile['counters']
+        counters[name] = counters.get(name, 0) + value
+
+
+@contextmanager
+def stage(name):
+    """
+    Measures the time spent in the context as a stage of the profiled
+    execution.
+    """
+    if _profile is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        calls, seconds = _profile['stages'].get(name, (0, 0))
+        _profile['stages'][name] = calls + 1, seconds + perf_counter() - start
+
+
+def profiled(function):
+    """
+    Function decorator for measuring the time spent in the decorated
+    function as a stage of the profiled execution.
+    """
+    # Create new function
+    def wrapper(*args, **kwargs):
+        if _profile is None:
+            return function(*args, **kwargs)
+        with stage(function.__name__):
+            return function(*args, **kwargs)
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__  = function.__doc__
+    # Return new function
+    return wrapper
+
+
+def begin_profile(cprofile):
+    """
+    Returns the state of a new profiled execution: the report of its stages
+    and counters, and a cProfile profiler as well if cprofile is True.
+    """
+    from cProfile import Profile
+    return {'report' : {'stages': {}, 'counters': {}},
+            'profile': Profile() if cprofile else None,
+            'orphans': sum(not mesh.users for mesh in bpy.data.meshes),
+            'seconds': 0}
+
+
+@contextmanager
+def resume_profile(state):
+    """
+    Profiles the execution in the context as a part of the profiled
+    execution of the state (if it is not None), which can be resumed any
+    number of times.
+    """
+    global _profile
+    if state is None:
+        yield
+        return
+    _profile = state['report']
+    profile  = state['profile']
+    start    = perf_counter()
+    if profile:
+        profile.enable()
+    try:
+        yield
+    finally:
+        if profile:
+            profile.disable()
+        state['seconds'] += perf_counter() - start
+        _profile = None
+
+
+def end_profile(state, folder, **fields):
+    """
+    Writes the report of the stages and counters of the profiled execution
+    of the state with the given fields (and the cProfile statistics) into
+    the folder.
+    """
+    from json import dumps
+    report = state['report']
+    report['seconds'] = state['seconds']
+    report['counters']['meshes orphaned'] = \
+        sum(not mesh.users for mesh in bpy.data.meshes) - state['orphans']
+    report['stages'] = {name: {'calls': calls, 'seconds': seconds}
+                        for name, (calls, seconds)
+                        in report['stages'].items()}
+    report.update(fields)
+    makedirs(folder, exist_ok=True)
+    filepath = join(folder, 'transition-{}-{}'.format(
+                        strftime('%Y%m%d-%H%M%S'), getpid()))
+    with open(filepath + '.json', 'w') as file:
+        file.write(dumps(report, indent=4, sort_keys=True))
+    if state['profile']:
+        state['profile'].dump_stats(filepath + '.prof')
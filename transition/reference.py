@@ -0,0 +1,96 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from array import array
+from string import ascii_lowercase
+
+# Import transition modules
+from .chains import word_chain
+from .meshes import bridge_faces, place_chain, subdivide
+from .packs import pack_profiles
+from .profiling import count
+
+
+#------------------------------------------------------------------------------#
+class ReferenceBackend:
+    """
+    Generates the transitions without blender, from the geometry of the
+    templates extracted into a pack. The profiles are aligned, placed and
+    bridged the same way as by the direct assembly, and the results are
+    returned as raw data in world space instead of being linked to scenes.
+    """
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def __init__(self, templates, stamp, distance=2, transize=1, circsize=1,
+                 subdsurf=3, circular=True):
+        self.templates = templates
+        self.stamp     = stamp
+        self.distance  = distance
+        self.transize  = transize
+        self.circsize  = circsize
+        self.subdsurf  = subdsurf
+        self.circular  = circular
+
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    def build(self, text, kerning, levels=None):
+        """
+        Returns the name, the flat vertex coordinates and the faces of the
+        linear or circular transition of the text, subdivided levels times (or
+        at the level of the subdivision if None). Raises a ValueError if the
+        text cannot be built.
+        """
+        # Check all transitions of the text
+        if not text or not set(text) <= set(ascii_lowercase):
+            raise ValueError('Text can only contain the letters a-z')
+        circular = self.circular
+        if circular:
+            text += text[0]
+        # A line needs at least two profiles to be bridged
+        elif len(text) < 2:
+            raise ValueError('Linear text needs at least two letters')
+        for char1, char2 in zip(text, text[1:]):
+            if kerning[ord(char1) - 97][ord(char2) - 97] is None:
+                raise ValueError('{} -> {}: missing transition'.format(char1,
+                                                                       char2))
+        # Get aligned chain of the profiles, and place it
+        loops = word_chain(text, kerning,
+                           (self.stamp, self.transize, self.circsize),
+                           lambda: pack_profiles(self.templates, self.transize,
+                                                 self.circsize),
+                           circular)
+        coords, last = place_chain(loops, self.distance, circular)
+        # The line starts from the origin
+        if last:
+            coords[1::3] = array('f', (y + last for y in coords[1::3]))
+        # Bridge the profiles, and subdivide the result
+        faces = bridge_faces(coords, len(loops[0][1]), circular)
+        coords, faces = subdivide(coords, list(zip(*[iter(faces)]*4)),
+                                  self.subdsurf if levels is None else levels)
+        count('vertices produced', len(coords)//3)
+        # Return raw data
+        return (text + ('_circular_transition' if circular else
+                        '_linear_transition'), coords, faces)
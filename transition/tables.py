@@ -0,0 +1,234 @@
+################################################################################
+#                                                                              #
+#                                MIT LICENSE                                   #
+#                                ===========                                   #
+#                                                                              #
+# Copyright (C) 2014 Peter Varo (http://www.sketchandprototype.com)            #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining a copy #
+# of this software and associated documentation files (the "Software"), to     #
+# deal in the Software without restriction, including without limitation the   #
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or  #
+# sell copies of the Software, and to permit persons to whom the Software is   #
+# furnished to do so, subject to the following conditions:                     #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included in   #
+# all copies or substantial portions of the Software.                          #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR   #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,     #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS #
+# IN THE SOFTWARE.                                                             #
+#                                                                              #
+################################################################################
+
+# Import Python modules
+from struct import pack, calcsize, unpack_from, error as StructError
+from os import getpid, makedirs, replace, stat
+from string import ascii_letters, ascii_lowercase
+from itertools import chain
+from os.path import join, dirname, abspath, isfile
+
+# Import Blender modules (if this is not blender, there is no opened blend file
+# to look for the kerning table next to)
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# Import transition modules
+from . import caches
+from .profiling import profiled
+
+
+#------------------------------------------------------------------------------#
+def toascii(string):
+    """
+    Removes white space and non ASCII letters, and returns result.
+    """
+    # If string contains only ascii chars
+    try:
+        string.encode('ascii')
+        # Remove all white spaces
+        return ''.join(string.split())
+    # If string contains other than ascii chars
+    except UnicodeEncodeError:
+        # Make it [A-Za-z] only
+        A, z = ord('A'), ord('z')
+        return ''.join(c if A <= ord(c) <= z else '' for c in chain(*string.split()))
+
+
+#------------------------------------------------------------------------------#
+def kerning_path():
+    """
+    Returns the path of the kerning table next to the opened blend file, or
+    next to the add-on if the blend file does not have one.
+    """
+    # If this is not blender, there is no opened blend file
+    path = join(dirname(bpy.data.filepath), 'kerning.json') if bpy else ''
+    return path if isfile(path) else join(dirname(dirname(abspath(__file__))),
+                                          'kerning.json')
+
+
+#------------------------------------------------------------------------------#
+def compile_kerning(kerning):
+    """
+    Returns a dense 26x26 table of the transition sequences of the kerning
+    dictionary, where table[i][j] is the sequence from the ith character to
+    the jth one (or None if there is no such sequence), and a dictionary of
+    the problems found, keyed by the character pairs.
+    """
+    table    = []
+    problems = {}
+    glyphs   = set(ascii_lowercase) | set(ascii_lowercase.upper()) | {0}
+    for char1 in ascii_lowercase:
+        row = []
+        for char2 in ascii_lowercase:
+            # Get sequence or the reversed sequence of the opposite direction
+            try:
+                steps = tuple(kerning[char1][char2])
+            except KeyError:
+                try:
+                    steps = tuple(kerning[char2][char1][::-1])
+                except KeyError:
+                    problems[char1, char2] = 'missing transition'
+                    row.append(None)
+                    continue
+            # Check sequence
+            if not set(steps) <= glyphs:
+                problems[char1, char2] = 'unknown glyph in {}'.format(steps)
+                steps = None
+            elif steps[0] != char1.upper() or steps[-1] != char2.upper():
+                problems[char1, char2] = 'mismatching ends in {}'.format(steps)
+            row.append(steps)
+        table.append(tuple(row))
+    # Return compiled table and problems
+    return tuple(table), problems
+
+
+#------------------------------------------------------------------------------#
+_kernings = {}
+
+def kerning_cache(filepath):
+    """
+    Returns the path of the compiled kerning table of the JSON file in the
+    cache folder (never next to the JSON file, which may come with a blend
+    file from anywhere).
+    """
+    from hashlib import sha1
+    return join(caches.CACHE_PATH, sha1(abspath(filepath).encode('utf-8')).hexdigest()
+                            + '.kerning')
+
+
+def write_kerning(filepath, stamp, table, problems):
+    """
+    Stores the compiled kerning table and its problems of the JSON file with
+    the stamp of the JSON file: the signature, the modification time and the
+    size, the number of the steps of every pair (255 if the pair is missing)
+    and the symbols of all the steps, then the number of the problems and
+    the pair, the length and the UTF-8 text of every problem.
+    """
+    pairs = list(chain(*table))
+    data  = [pack('<4sdQ', b'TRK1', *stamp),
+             bytes(255 if steps is None else len(steps) for steps in pairs),
+             ''.join(str(s) for s in chain(*filter(None, pairs))).encode(),
+             pack('<H', len(problems))]
+    for (char1, char2), problem in sorted(problems.items()):
+        problem = problem.encode('utf-8')
+        data.append(pack('<2sH', (char1 + char2).encode('ascii'),
+                         len(problem)) + problem)
+    makedirs(caches.CACHE_PATH, exist_ok=True)
+    cachepath = kerning_cache(filepath)
+    temporary = '{}.{}.tmp'.format(cachepath, getpid())
+    with open(temporary, 'wb') as file:
+        file.writelines(data)
+    replace(temporary, cachepath)
+
+
+def read_kerning(filepath, stamp):
+    """
+    Returns the compiled kerning table and its problems of the JSON file from
+    the cache folder, or None if it is not stored for the stamp (or it is
+    truncated or damaged).
+    """
+    try:
+        with open(kerning_cache(filepath), 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    offset = calcsize('<4sdQ')
+    if len(data) < offset + 26*26:
+        return None
+    signature, *stored = unpack_from('<4sdQ', data)
+    if signature != b'TRK1' or tuple(stored) != stamp:
+        return None
+    sizes  = data[offset:offset + 26*26]
+    offset = offset + 26*26
+    length = sum(size for size in sizes if size != 255)
+    try:
+        symbols = data[offset:offset + length].decode('ascii')
+        offset += length
+        if not set(symbols) <= set(ascii_letters + '0'):
+            return None
+        # Split the symbols into the steps of the pairs
+        pairs = []
+        start = 0
+        for size in sizes:
+            if size == 255:
+                pairs.append(None)
+                continue
+            steps = tuple(symbols[start:start + size])
+            if '0' in steps:
+                steps = tuple(0 if s == '0' else s for s in steps)
+            pairs.append(steps)
+            start += size
+        problems = {}
+        length = unpack_from('<H', data, offset)[0]
+        offset += 2
+        for i in range(length):
+            pair, size = unpack_from('<2sH', data, offset)
+            offset += 4
+            problems[tuple(pair.decode('ascii'))] = \
+                data[offset:offset + size].decode('utf-8')
+            offset += size
+    except (UnicodeDecodeError, StructError):
+        return None
+    if offset != len(data):
+        return None
+    return tuple(tuple(pairs[i:i + 26]) for i in range(0, 26*26, 26)), problems
+
+
+@profiled
+def load_kerning(filepath, binary=True):
+    """
+    Returns the compiled kerning table and its problems of the JSON file.
+    Compiled tables are cached until the file is modified, and if binary is
+    True they are also stored in the cache folder.
+    """
+    from json import load
+    stamp = stat(filepath)
+    stamp = stamp.st_mtime, stamp.st_size
+    # If table is cached in memory
+    try:
+        cached = _kernings[filepath]
+        if cached[0] == stamp:
+            return cached[1:]
+    except KeyError:
+        pass
+    # If table is cached on disk
+    compiled = read_kerning(filepath, stamp) if binary else None
+    # If table has to be compiled
+    if compiled is None:
+        with open(filepath) as file:
+            compiled = compile_kerning(load(file))
+        if binary:
+            try:
+                write_kerning(filepath, stamp, *compiled)
+            except OSError:
+                pass
+    # Cache and return table
+    cached = _kernings[filepath] = (stamp,) + compiled
+    return cached[1:]